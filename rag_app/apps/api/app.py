@@ -0,0 +1,92 @@
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+
+from rag_app.core.storage.page_assets import PAGE_SIZES, get_page_image, page_validators, source_pdf
+from rag_app.core.utils.metrics import export_prometheus, incr
+
+app = FastAPI(title="Catalog AI - Page Assets")
+
+# Page renders only change on re-ingest; clients revalidate with ETag after a day
+CACHE_CONTROL = "public, max-age=86400"
+
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        return etag in [t.strip() for t in inm.split(",")] or inm.strip() == "*"
+
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _validator_headers(etag: str, last_modified: float) -> dict:
+    return {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+
+@app.get("/tenants/{tenant_id}/docs/{doc_id}/pages/{page_num}")
+def page_image(
+    tenant_id: str,
+    doc_id: str,
+    page_num: int,
+    request: Request,
+    size: str = Query("medium", description=f"One of {', '.join(PAGE_SIZES)}"),
+) -> Response:
+    """
+    Rendered page image. Revalidation costs a stat() and a 304; hot pages come from memory.
+    """
+    try:
+        src = page_validators(tenant_id, doc_id, page_num, size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if src is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    headers = _validator_headers(src.etag, src.last_modified)
+    if _not_modified(request, src.etag, src.last_modified):
+        incr("page_asset_not_modified")
+        return Response(status_code=304, headers=headers)
+
+    asset = get_page_image(tenant_id, doc_id, page_num, size)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    incr("page_asset_bytes_sent", len(asset.data))
+    return Response(content=asset.data, media_type=asset.media_type, headers=_validator_headers(asset.etag, asset.last_modified))
+
+
+@app.get("/tenants/{tenant_id}/docs/{doc_id}/source.pdf")
+def source_document(tenant_id: str, doc_id: str, request: Request) -> Response:
+    """
+    Original brochure PDF. FileResponse streams from disk and answers Range requests
+    (206 Partial Content), so viewers can jump to #page=N without a full download.
+    """
+    try:
+        src = source_pdf(tenant_id, doc_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if src is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    headers = _validator_headers(src.etag, src.last_modified)
+    if _not_modified(request, src.etag, src.last_modified):
+        incr("page_asset_not_modified")
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(src.path, media_type="application/pdf", headers=headers)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    return export_prometheus()
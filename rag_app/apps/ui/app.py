@@ -1,7 +1,11 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
 import streamlit as st
-from pathlib import Path
 
 from rag_app.core.rag.chain import answer_question
+from rag_app.core.warmup import warm_up
 
 st.set_page_config(
     page_title="Catalog AI - My Home Tridasa",
@@ -26,6 +30,117 @@ st.markdown("""
 st.title("🏢 My Home Tridasa - AI Assistant")
 st.caption("Direct, factual information about the Tridasa project. Includes floor plans and site layouts.")
 
+
+# ----------------------------
+# Process-wide cached resources
+# ----------------------------
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    # Shared by all sessions: questions run here so the script thread never blocks on Mongo/HF/Groq
+    return ThreadPoolExecutor(max_workers=int(os.getenv("UI_WORKERS", "8")), thread_name_prefix="rag-ui")
+
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up(tenant_id: str, doc_id: str) -> Dict[str, Any]:
+    # Once per (tenant, doc) per process: connect Mongo, build clients, prime the chunk cache
+    return warm_up(tenant_id=tenant_id, doc_id=doc_id, background=True)
+
+
+# Width history images are shown at; full page renders are several MB
+HISTORY_IMAGE_WIDTH = 1024
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _read_image(path: str, mtime: float) -> bytes:
+    # mtime is part of the cache key so a re-rendered page image is picked up.
+    # Downscaled once here, so each rerun hands st.image ~100 KB instead of re-hashing
+    # and re-resizing the full render for every past turn.
+    import io
+
+    from PIL import Image
+
+    img = Image.open(path)
+    if img.width <= HISTORY_IMAGE_WIDTH:
+        with open(path, "rb") as f:
+            return f.read()
+    img = img.resize((HISTORY_IMAGE_WIDTH, round(img.height * HISTORY_IMAGE_WIDTH / img.width)), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def load_image(path: str) -> Optional[bytes]:
+    try:
+        return _read_image(path, os.path.getmtime(path))
+    except OSError:
+        return None
+
+
+# ----------------------------
+# Rendering helpers
+# ----------------------------
+def build_assistant_message(res: Dict[str, Any]) -> Dict[str, Any]:
+    images: List[str] = []
+    image_urls: List[Optional[str]] = []
+    page_nums: List[Any] = []
+    pdf_links: List[Optional[str]] = []
+    seen_pages = set()
+
+    # Sort citations by score
+    sorted_citations = sorted(
+        res.get("citations", []),
+        key=lambda x: x.get("score") or 0,
+        reverse=True
+    )
+
+    for c in sorted_citations:
+        img = c.get("image_path")
+        page = c.get("page_num")
+        link = c.get("pdf_link")
+        if img and page not in seen_pages:
+            images.append(img)
+            image_urls.append(c.get("image_url"))
+            page_nums.append(page)
+            pdf_links.append(link)
+            seen_pages.add(page)
+
+    return {
+        "role": "assistant",
+        "content": res["answer"],
+        "images": images,
+        "image_urls": image_urls,
+        "page_nums": page_nums,
+        "pdf_links": pdf_links,
+        "show_images": len(images) > 0,
+    }
+
+
+def render_message(msg: Dict[str, Any]) -> None:
+    st.markdown(msg["content"])
+
+    # Display images and their individual source links
+    if msg.get("show_images"):
+        images = msg.get("images", [])
+        image_urls = msg.get("image_urls", [])
+        page_nums = msg.get("page_nums", [])
+        pdf_links = msg.get("pdf_links", [])
+
+        if images:
+            cols = st.columns(min(len(images), 2))
+            for idx, img in enumerate(images[:2]):
+                with cols[idx]:
+                    caption = f"Page {page_nums[idx]}" if idx < len(page_nums) else "Source Image"
+                    # With the page-asset API, only the URL goes over the websocket and the
+                    # browser keeps the image cached (ETag) across reruns
+                    url = image_urls[idx] if idx < len(image_urls) else None
+                    data = url or load_image(img)
+                    if data is not None:
+                        st.image(data, width="stretch", caption=caption)
+                    # Show individual link for this specific page using standard markdown
+                    if idx < len(pdf_links) and pdf_links[idx]:
+                        st.markdown(f"🔗 [Source {page_nums[idx]}]({pdf_links[idx]})")
+
+
 # ----------------------------
 # Sidebar for configuration
 # ----------------------------
@@ -34,117 +149,83 @@ with st.sidebar:
     doc_id = st.text_input("Document ID", value="My-Home-Tridasa-E-Brochure")
     tenant_id = st.text_input("Tenant ID", value="tenant_01")
     k_value = st.slider("Context chunks (k)", 1, 25, 15)
-    
+
     st.divider()
     if st.button("Clear Chat History", use_container_width=True):
         st.session_state.messages = []
+        st.session_state.pending = None
         st.rerun()
 
+start_warm_up(tenant_id, doc_id)
+
 # ----------------------------
 # Session state: chat history
 # ----------------------------
 if "messages" not in st.session_state:
     st.session_state.messages = []
+if "pending" not in st.session_state:
+    st.session_state.pending = None
 
 # ----------------------------
 # Render chat history
 # ----------------------------
 for msg in st.session_state.messages:
     with st.chat_message(msg["role"]):
-        st.markdown(msg["content"])
-
-        # Display images and their individual source links
-        if msg.get("show_images"):
-            images = msg.get("images", [])
-            page_nums = msg.get("page_nums", [])
-            pdf_links = msg.get("pdf_links", [])
-            
-            if images:
-                cols = st.columns(min(len(images), 2))
-                for idx, img in enumerate(images[:2]):
-                    with cols[idx]:
-                        caption = f"Page {page_nums[idx]}" if idx < len(page_nums) else "Source Image"
-                        st.image(img, width="stretch", caption=caption)
-                        # Show individual link for this specific page using standard markdown
-                        if idx < len(pdf_links) and pdf_links[idx]:
-                            st.markdown(f"🔗 [Source {page_nums[idx]}]({pdf_links[idx]})")
+        render_message(msg)
+
+
+# ----------------------------
+# Pending answer (polled without rerunning the whole script)
+# ----------------------------
+@st.fragment(run_every=0.5)
+def pending_answer() -> None:
+    fut: Optional[Future] = st.session_state.pending
+    if fut is None:
+        return
+
+    if not fut.done():
+        with st.chat_message("assistant"):
+            st.markdown("_Analyzing brochure..._")
+        return
+
+    st.session_state.pending = None
+    try:
+        st.session_state.messages.append(build_assistant_message(fut.result()))
+    except Exception as e:
+        st.session_state.messages.append(
+            {
+                "role": "assistant",
+                "content": f"Error: {str(e)}\n\nTechnical Details: Ensure MongoDB is connected and the .env file is correctly configured.",
+            }
+        )
+    # Full rerun so the new message joins the (cached) history
+    st.rerun(scope="app")
+
+
+if st.session_state.pending is not None:
+    pending_answer()
 
 # ----------------------------
 # Chat input
 # ----------------------------
-question = st.chat_input("Ask about towers, dimensions, or site plans...")
+question = st.chat_input(
+    "Ask about towers, dimensions, or site plans...",
+    disabled=st.session_state.pending is not None,
+)
 
 if question:
-    # 1. Add user message to state and UI
+    # Prepare chat history for the chain
+    history = [{"role": m["role"], "content": m["content"]} for m in st.session_state.messages]
     st.session_state.messages.append({"role": "user", "content": question})
-    with st.chat_message("user"):
-        st.markdown(question)
-
-    # 2. Generate and display assistant response
-    with st.chat_message("assistant"):
-        with st.spinner("Analyzing brochure..."):
-            try:
-                # Prepare chat history for the chain
-                history = [{"role": m["role"], "content": m["content"]} for m in st.session_state.messages[:-1]]
-                
-                # Call the RAG chain
-                res = answer_question(
-                    question,
-                    tenant_id=tenant_id,
-                    doc_id=doc_id,
-                    k=k_value,
-                    index_name="vector_index",
-                    chat_history=history
-                )
-                
-                # Display the answer
-                st.markdown(res["answer"])
-
-                # 3. Handle Images and individual links
-                images = []
-                page_nums = []
-                pdf_links = []
-                seen_pages = set()
-                
-                # Sort citations by score
-                sorted_citations = sorted(
-                    res.get("citations", []), 
-                    key=lambda x: x.get("score", 0), 
-                    reverse=True
-                )
-
-                for c in sorted_citations:
-                    img = c.get("image_path")
-                    page = c.get("page_num")
-                    link = c.get("pdf_link")
-                    if img and page not in seen_pages:
-                        images.append(img)
-                        page_nums.append(page)
-                        pdf_links.append(link)
-                        seen_pages.add(page)
-                
-                show_images = len(images) > 0
-
-                if show_images:
-                    cols = st.columns(min(len(images), 2))
-                    for idx, img in enumerate(images[:2]):
-                        with cols[idx]:
-                            st.image(img, width="stretch", caption=f"Page {page_nums[idx]}")
-                            # Show individual link for this specific page using standard markdown
-                            if idx < len(pdf_links) and pdf_links[idx]:
-                                st.markdown(f"🔗 [Source{page_nums[idx]}]({pdf_links[idx]})")
-
-                # 4. Save assistant message to session state
-                st.session_state.messages.append(
-                    {
-                        "role": "assistant",
-                        "content": res["answer"],
-                        "images": images,
-                        "page_nums": page_nums,
-                        "pdf_links": pdf_links,
-                        "show_images": show_images,
-                    }
-                )
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-                st.info("Technical Details: Ensure MongoDB is connected and the .env file is correctly configured.")
+
+    # Submit to the shared backend pool; the fragment above picks up the result
+    st.session_state.pending = get_executor().submit(
+        answer_question,
+        question,
+        tenant_id=tenant_id,
+        doc_id=doc_id,
+        k=k_value,
+        index_name="vector_index",
+        chat_history=history,
+    )
+    st.rerun()
@@ -15,4 +15,52 @@ HUGGINGFACE_EMBED_MODEL = os.getenv("HUGGINGFACE_EMBED_MODEL", "sentence-transfo
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 
-IMAGE_OUT_DIR = os.getenv("IMAGE_OUT_DIR", "storage/images")
\ No newline at end of file
+IMAGE_OUT_DIR = os.getenv("IMAGE_OUT_DIR", "storage/images")
+
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "storage/checkpoints")
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+INGEST_PER_TENANT = int(os.getenv("INGEST_PER_TENANT", "2"))
+
+# "list" (legacy float array), "float32" / "int8" (BSON binary vectors), or "float16" (int8 index vector + float16 rescoring copy)
+EMBEDDING_STORAGE_FORMAT = os.getenv("EMBEDDING_STORAGE_FORMAT", "list")
+
+# Two-phase retrieval: vector search returns ids/scores, bodies come from an LRU / batched fetch
+RETRIEVAL_TWO_PHASE = os.getenv("RETRIEVAL_TWO_PHASE", "1") == "1"
+CHUNK_CACHE_SIZE = int(os.getenv("CHUNK_CACHE_SIZE", "4096"))
+
+# Optional cross-encoder reranking of retrieved candidates
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "0") == "1"
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "30"))
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "5"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "400"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "8192"))
+
+# Outbound call scheduling (per-provider token bucket + concurrency cap)
+HF_RATE_PER_SEC = float(os.getenv("HF_RATE_PER_SEC", "10"))
+HF_BURST = float(os.getenv("HF_BURST", "20"))
+HF_MAX_CONCURRENCY = int(os.getenv("HF_MAX_CONCURRENCY", "4"))
+GROQ_RATE_PER_SEC = float(os.getenv("GROQ_RATE_PER_SEC", "5"))
+GROQ_BURST = float(os.getenv("GROQ_BURST", "10"))
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "4"))
+BACKGROUND_SHARE = float(os.getenv("BACKGROUND_SHARE", "0.5"))  # max fraction of slots for background calls
+
+# Index bootstrap / page lookups
+EMBED_DIM = int(os.getenv("EMBED_DIM", "384"))  # all-MiniLM-L6-v2
+PAGE_DIRECT_MAX_CHUNKS = int(os.getenv("PAGE_DIRECT_MAX_CHUNKS", "12"))
+
+# Ingest-time answer materialization for frequent questions
+MATERIALIZE_ENABLED = os.getenv("MATERIALIZE_ENABLED", "1") == "1"
+MONGODB_ANSWERS_COLLECTION = os.getenv("MONGODB_ANSWERS_COLLECTION", "answers")
+MATERIALIZE_QUESTIONS_PATH = os.getenv("MATERIALIZE_QUESTIONS_PATH")  # JSON: {"<doc_id>" | "*": [questions]}
+MATERIALIZE_INDEX_WAIT_S = float(os.getenv("MATERIALIZE_INDEX_WAIT_S", "300"))  # max wait for the vector index to catch up
+
+# Near-duplicate chunk collapsing at ingest
+DEDUPE_ENABLED = os.getenv("DEDUPE_ENABLED", "1") == "1"
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.85"))
+
+# Page asset serving (rag_app/apps/api)
+PDF_SOURCE_DIR = os.getenv("PDF_SOURCE_DIR", "rag_app/data/raw")  # fallback for documents ingested before source paths were recorded
+MONGODB_DOCS_COLLECTION = os.getenv("MONGODB_DOCS_COLLECTION", "documents")  # one record per ingested document (source path, version)
+PAGE_ASSET_BASE_URL = os.getenv("PAGE_ASSET_BASE_URL")  # e.g. http://localhost:8000; unset = legacy public brochure link
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
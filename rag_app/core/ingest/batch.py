@@ -0,0 +1,166 @@
+# rag_app/core/ingest/batch.py
+
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from rag_app.core.config import CHECKPOINT_DIR, INGEST_PER_TENANT, INGEST_WORKERS
+from rag_app.core.ingest.checkpoint import IngestCheckpoint, source_identity
+from rag_app.core.ingest.pipeline import ingest_pdf
+
+
+@dataclass
+class IngestJob:
+    pdf_path: str
+    tenant_id: str
+    doc_id: str
+    ocr_lang: str = "eng"
+
+
+def load_jobs(source: str, tenant_id: Optional[str] = None, ocr_lang: str = "eng") -> List[IngestJob]:
+    """
+    Build jobs from either:
+    - a directory: every *.pdf inside becomes a job (doc_id = file stem, tenant_id required), or
+    - a manifest: JSON list or JSON Lines of {"pdf_path", "tenant_id", "doc_id", "ocr_lang"?}.
+      Missing tenant_id / doc_id fall back to the `tenant_id` argument / file stem.
+    """
+    src = Path(source)
+
+    if src.is_dir():
+        if not tenant_id:
+            raise ValueError("tenant_id is required when ingesting a directory")
+        return [
+            IngestJob(pdf_path=str(p), tenant_id=tenant_id, doc_id=p.stem, ocr_lang=ocr_lang)
+            for p in sorted(src.glob("*.pdf"))
+        ]
+
+    raw = src.read_text(encoding="utf-8").strip()
+    if raw.startswith("["):
+        entries = json.loads(raw)
+    else:
+        entries = [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+    jobs: List[IngestJob] = []
+    for e in entries:
+        pdf_path = e["pdf_path"]
+        tenant = e.get("tenant_id") or tenant_id
+        if not tenant:
+            raise ValueError(f"No tenant_id for {pdf_path}")
+        jobs.append(
+            IngestJob(
+                pdf_path=pdf_path,
+                tenant_id=tenant,
+                doc_id=e.get("doc_id") or Path(pdf_path).stem,
+                ocr_lang=e.get("ocr_lang", ocr_lang),
+            )
+        )
+    return jobs
+
+
+def _run_job(job: IngestJob, checkpoint_dir: str, force: bool, **ingest_kwargs: Any) -> Dict[str, Any]:
+    checkpoint = IngestCheckpoint.for_doc(job.tenant_id, job.doc_id, base_dir=checkpoint_dir)
+
+    # Progress recorded for another file (moved manifest entry, updated brochure) is not reusable
+    source = source_identity(job.pdf_path)
+    if force or checkpoint.source != source:
+        checkpoint.reset(source=source)
+    elif checkpoint.done:
+        return {
+            "pdf_path": job.pdf_path,
+            "tenant_id": job.tenant_id,
+            "doc_id": job.doc_id,
+            "skipped": True,
+        }
+
+    return ingest_pdf(
+        pdf_path=job.pdf_path,
+        tenant_id=job.tenant_id,
+        doc_id=job.doc_id,
+        ocr_lang=job.ocr_lang,
+        checkpoint=checkpoint,
+        **ingest_kwargs,
+    )
+
+
+def run_batch(
+    jobs: List[IngestJob],
+    *,
+    workers: int = INGEST_WORKERS,
+    per_tenant: int = INGEST_PER_TENANT,
+    checkpoint_dir: str = CHECKPOINT_DIR,
+    force: bool = False,
+    **ingest_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Ingest many documents on a worker pool.
+
+    At most `workers` documents run at once and at most `per_tenant` of them
+    belong to the same tenant, so one large onboarding cannot starve others.
+    Every document is checkpointed; documents finished by an earlier run are
+    skipped and interrupted ones resume (use `force` to start over). A
+    checkpoint written for a different file, or for the same file before it
+    changed, is discarded.
+    Page rendering (PyMuPDF) is serialized across workers; OCR, embedding and
+    storage run in parallel.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if per_tenant < 1:
+        raise ValueError("per_tenant must be >= 1")
+
+    queue: Deque[IngestJob] = deque(jobs)
+    running: Dict[Future, IngestJob] = {}
+    running_per_tenant: Dict[str, int] = {}
+
+    results: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while queue or running:
+            # Dispatch every queued job whose tenant still has capacity
+            deferred: Deque[IngestJob] = deque()
+            while queue and len(running) < workers:
+                job = queue.popleft()
+                if running_per_tenant.get(job.tenant_id, 0) >= per_tenant:
+                    deferred.append(job)
+                    continue
+
+                fut = pool.submit(_run_job, job, checkpoint_dir, force, **ingest_kwargs)
+                running[fut] = job
+                running_per_tenant[job.tenant_id] = running_per_tenant.get(job.tenant_id, 0) + 1
+            queue.extendleft(reversed(deferred))
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                job = running.pop(fut)
+                running_per_tenant[job.tenant_id] -= 1
+                try:
+                    res = fut.result()
+                    results.append(res)
+                    print(f"[ingest] done {job.tenant_id}/{job.doc_id}: {res}")
+                except Exception as e:
+                    errors.append({"pdf_path": job.pdf_path, "tenant_id": job.tenant_id, "doc_id": job.doc_id, "error": str(e)})
+                    print(f"[ingest] FAILED {job.tenant_id}/{job.doc_id}: {e}")
+
+    elapsed = time.perf_counter() - started
+    pages = sum(r.get("pages", 0) for r in results)
+    chunks = sum(r.get("chunks_inserted", 0) for r in results)
+
+    return {
+        "documents": len(jobs),
+        "completed": sum(1 for r in results if not r.get("skipped")),
+        "skipped": sum(1 for r in results if r.get("skipped")),
+        "failed": len(errors),
+        "pages": pages,
+        "chunks_inserted": chunks,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 3) if elapsed > 0 else 0.0,
+        "chunks_per_sec": round(chunks / elapsed, 3) if elapsed > 0 else 0.0,
+        "results": results,
+        "errors": errors,
+    }
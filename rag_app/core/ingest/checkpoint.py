@@ -0,0 +1,106 @@
+# rag_app/core/ingest/checkpoint.py
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+from rag_app.core.config import CHECKPOINT_DIR
+
+
+@dataclass
+class IngestCheckpoint:
+    """
+    Progress of one document ingest, persisted as JSON so an interrupted
+    job can resume: OCR'd page texts, the chunks already stored in MongoDB
+    and the ingest version those chunks were written with. `source` records
+    which PDF (path, size, mtime) that progress belongs to.
+    """
+    path: str
+    version: str = ""
+    source: Dict[str, Any] = field(default_factory=dict)  # see source_identity()
+    pages: Dict[int, str] = field(default_factory=dict)   # page_num -> OCR text
+    stored_chunks: Set[str] = field(default_factory=set)  # "page_num:chunk_index"
+    done: bool = False
+
+    @classmethod
+    def for_doc(cls, tenant_id: str, doc_id: str, base_dir: str = CHECKPOINT_DIR) -> "IngestCheckpoint":
+        path = Path(base_dir) / tenant_id / f"{doc_id}.json"
+        return cls.load(str(path))
+
+    @classmethod
+    def load(cls, path: str) -> "IngestCheckpoint":
+        p = Path(path)
+        if not p.exists():
+            return cls(path=path)
+
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return cls(
+            path=path,
+            version=data.get("version", ""),
+            source=data.get("source", {}),
+            pages={int(k): v for k, v in data.get("pages", {}).items()},
+            stored_chunks=set(data.get("stored_chunks", [])),
+            done=bool(data.get("done", False)),
+        )
+
+    def save(self) -> None:
+        """
+        Write atomically (temp file + rename) so a crash never leaves a torn checkpoint.
+        """
+        p = Path(self.path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            "version": self.version,
+            "source": self.source,
+            "pages": {str(k): v for k, v in self.pages.items()},
+            "stored_chunks": sorted(self.stored_chunks),
+            "done": self.done,
+        }
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def mark_page(self, page_num: int, text: str) -> None:
+        self.pages[page_num] = text
+        self.save()
+
+    def mark_chunks(self, keys: Iterable[str]) -> None:
+        self.stored_chunks.update(keys)
+        self.save()
+
+    def mark_version(self, version: str) -> None:
+        self.version = version
+        self.save()
+
+    def mark_done(self) -> None:
+        self.done = True
+        self.save()
+
+    def reset(self, source: Optional[Dict[str, Any]] = None) -> None:
+        self.version = ""
+        self.source = source or {}
+        self.pages.clear()
+        self.stored_chunks.clear()
+        self.done = False
+        self.save()
+
+
+def source_identity(pdf_path: str) -> Dict[str, Any]:
+    """
+    Identify the PDF a checkpoint was written for; a replaced or edited file
+    at the same path gets a different size or mtime. A missing file has
+    neither (the ingest itself will report it).
+    """
+    p = Path(pdf_path).resolve()
+    try:
+        st = p.stat()
+    except OSError:
+        return {"pdf_path": str(p), "size": None, "mtime_ns": None}
+    return {"pdf_path": str(p), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def chunk_key(page_num: int, chunk_index: int) -> str:
+    return f"{page_num}:{chunk_index}"
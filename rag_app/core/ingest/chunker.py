@@ -1,6 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from rag_app.core.ingest.extractor import ExtractedPage
 
@@ -11,6 +10,7 @@ class TextChunk:
     chunk_index: int
     text: str
     image_path: str
+    source_pages: List[int] = field(default_factory=list)  # all pages this text appears on (see dedupe)
 
 
 def chunk_pages(
@@ -27,6 +27,8 @@ def chunk_pages(
     - Optimized separators to avoid cutting words or important layout markers.
     - Increased default chunk size for richer context.
     """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     chunks: List[TextChunk] = []
     
     # Initialize the splitter with meaningful separators
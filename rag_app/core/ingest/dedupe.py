@@ -0,0 +1,131 @@
+# rag_app/core/ingest/dedupe.py
+
+import random
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from rag_app.core.ingest.chunker import TextChunk
+
+_PAGE_PREFIX_RE = re.compile(r"^\[Page \d+\]\s*")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """
+    MinHash signatures over word 3-gram shingles, with LSH banding to find
+    candidate pairs without comparing every chunk against every other.
+
+    Hash parameters come from a fixed seed so signatures are identical across
+    runs (resumed ingests must make the same dedupe decisions).
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._a = [rng.randint(1, _MERSENNE_PRIME - 1) for _ in range(num_perm)]
+        self._b = [rng.randint(0, _MERSENNE_PRIME - 1) for _ in range(num_perm)]
+
+    def signature(self, tokens: List[str]) -> Tuple[int, ...]:
+        if len(tokens) >= 3:
+            shingles = {" ".join(tokens[i : i + 3]) for i in range(len(tokens) - 2)}
+        else:
+            shingles = {" ".join(tokens)}
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+    def band_keys(self, sig: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(i, sig[i * self.rows : (i + 1) * self.rows]) for i in range(self.bands)]
+
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """
+        Estimated Jaccard similarity of the underlying shingle sets.
+        """
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def _tokens(text: str) -> List[str]:
+    # Ignore the "[Page N]" prefix added by chunk_pages; otherwise every page would differ
+    return _TOKEN_RE.findall(_PAGE_PREFIX_RE.sub("", text or "").lower())
+
+
+def _numbers(tokens: List[str]) -> Tuple[str, ...]:
+    # Areas, floor counts, unit types ("3bhk"): one differing figure makes it a different fact
+    return tuple(t for t in tokens if any(ch.isdigit() for ch in t))
+
+
+def dedupe_chunks(
+    chunks: List[TextChunk],
+    threshold: float = 0.85,
+    min_tokens: int = 12,
+    hasher: Optional[MinHasher] = None,
+) -> Tuple[List[TextChunk], Dict[str, float]]:
+    """
+    Collapse near-duplicate chunks (repeated tower descriptions, spec tables,
+    per-page disclaimers) into the first occurrence, which records every page
+    it appeared on in `source_pages`. Only chunks with exactly the same numeric
+    tokens are merged, so "2150 sq ft" and "2450 sq ft" rows stay separate.
+
+    Chunks shorter than `min_tokens` (e.g. image-only page placeholders) are always kept.
+    Returns the kept chunks and stats including `dedupe_ratio` (fraction removed).
+    """
+    hasher = hasher or MinHasher()
+    kept: List[TextChunk] = []
+    signatures: List[Tuple[int, ...]] = []
+    # LSH buckets are keyed by the chunk's numbers too, so only same-number chunks are candidates
+    buckets: Dict[Tuple[Tuple[str, ...], int, Tuple[int, ...]], List[int]] = {}
+
+    for c in chunks:
+        if not c.source_pages:
+            c.source_pages = [c.page_num]
+
+        tokens = _tokens(c.text)
+        if len(tokens) < min_tokens:
+            kept.append(c)
+            signatures.append(())
+            continue
+
+        sig = hasher.signature(tokens)
+        nums = _numbers(tokens)
+        keys = [(nums, *band) for band in hasher.band_keys(sig)]
+
+        candidates = {i for key in keys for i in buckets.get(key, [])}
+        match = None
+        for i in sorted(candidates):
+            if hasher.similarity(sig, signatures[i]) >= threshold:
+                match = i
+                break
+
+        if match is not None:
+            canonical = kept[match]
+            for p in c.source_pages:
+                if p not in canonical.source_pages:
+                    canonical.source_pages.append(p)
+            continue
+
+        kept.append(c)
+        signatures.append(sig)
+        for key in keys:
+            buckets.setdefault(key, []).append(len(kept) - 1)
+
+    total = len(chunks)
+    removed = total - len(kept)
+    return kept, {
+        "chunks_before": total,
+        "chunks_after": len(kept),
+        "duplicates_removed": removed,
+        "dedupe_ratio": round(removed / total, 4) if total else 0.0,
+    }
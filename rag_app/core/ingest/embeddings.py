@@ -1,16 +1,24 @@
 # rag_app/core/ingest/embeddings.py
 
-import time
-from typing import List
-from langchain_huggingface import HuggingFaceEndpointEmbeddings
+from functools import lru_cache
+from typing import TYPE_CHECKING, List
 
 from rag_app.core.config import HUGGINGFACE_API_KEY, HUGGINGFACE_EMBED_MODEL
+from rag_app.core.utils.metrics import incr
+from rag_app.core.utils.scheduler import BACKGROUND, get_provider
 
 
-def get_embedder() -> HuggingFaceEndpointEmbeddings:
+if TYPE_CHECKING:
+    from langchain_huggingface import HuggingFaceEndpointEmbeddings
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> "HuggingFaceEndpointEmbeddings":
     if not HUGGINGFACE_API_KEY:
         raise ValueError("HUGGINGFACE_API_KEY is not set")
 
+    from langchain_huggingface import HuggingFaceEndpointEmbeddings
+
     return HuggingFaceEndpointEmbeddings(
         model=HUGGINGFACE_EMBED_MODEL,
         task="feature-extraction",
@@ -21,37 +29,36 @@ def get_embedder() -> HuggingFaceEndpointEmbeddings:
 def embed_texts(texts: List[str], batch_size: int = 8, retries: int = 5) -> List[List[float]]:
     """
     Embed texts using HF Inference API in small batches to avoid 504 timeouts.
+    Runs in the scheduler's background lane so ingest never starves live queries.
     """
     embedder = get_embedder()
+    provider = get_provider("huggingface")
     all_vectors: List[List[float]] = []
 
     for i in range(0, len(texts), batch_size):
         batch = texts[i : i + batch_size]
 
-        for attempt in range(retries):
-            try:
-                vecs = embedder.embed_documents(batch)
-                all_vectors.extend(vecs)
-                break
-            except Exception as e:
-                # simple backoff: 1s, 2s, 4s, 8s...
-                sleep_s = 2 ** attempt
-                print(f"HF embed failed (batch {i//batch_size}, attempt {attempt+1}/{retries}): {e}")
-                time.sleep(sleep_s)
-        else:
-            raise RuntimeError("HuggingFace embeddings failed after retries")
+        vecs = provider.call(
+            lambda: embedder.embed_documents(batch),
+            priority=BACKGROUND,
+            retries=retries,
+        )
+        all_vectors.extend(vecs)
+        incr("embed_batches")
 
     return all_vectors
 
 
 def embed_query(query: str, retries: int = 5) -> List[float]:
+    """
+    Embed a user query. Identical queries in flight at the same time share one HF call.
+    """
     embedder = get_embedder()
 
-    for attempt in range(retries):
-        try:
-            return embedder.embed_query(query)
-        except Exception as e:
-            time.sleep(2 ** attempt)
-            print(f"HF query embed failed attempt {attempt+1}/{retries}: {e}")
-
-    raise RuntimeError("HuggingFace query embedding failed after retries")
+    vec = get_provider("huggingface").call(
+        lambda: embedder.embed_query(query),
+        key=("embed_query", HUGGINGFACE_EMBED_MODEL, query),
+        retries=retries,
+    )
+    incr("embed_queries")
+    return vec
@@ -2,8 +2,9 @@
 # Beginner version: ALWAYS OCR, no native text logic
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
+from rag_app.core.ingest.checkpoint import IngestCheckpoint
 from rag_app.core.ingest.pdf_loader import PdfPage
 from rag_app.core.ocr.tesseract import ocr_image_bytes
 
@@ -18,14 +19,22 @@ class ExtractedPage:
 def extract_pages_with_ocr(
     pages: List[PdfPage],
     ocr_lang: str = "eng",
+    checkpoint: Optional[IngestCheckpoint] = None,
 ) -> List[ExtractedPage]:
     """
     Always runs OCR on every page image.
+    With a checkpoint, pages OCR'd by a previous (interrupted) run are reused
+    and each newly OCR'd page is recorded as soon as it finishes.
     """
     extracted: List[ExtractedPage] = []
 
     for page in pages:
-        text = ocr_image_bytes(page.image_bytes, lang=ocr_lang)
+        if checkpoint is not None and page.page_num in checkpoint.pages:
+            text = checkpoint.pages[page.page_num]
+        else:
+            text = ocr_image_bytes(page.image_bytes, lang=ocr_lang)
+            if checkpoint is not None:
+                checkpoint.mark_page(page.page_num, text)
 
         extracted.append(
             ExtractedPage(
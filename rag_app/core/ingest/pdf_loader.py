@@ -1,9 +1,13 @@
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
-import fitz  # PyMuPDF
-from langchain_community.document_loaders import PyMuPDFLoader
+from rag_app.core.config import IMAGE_OUT_DIR
+
+# PyMuPDF is not thread-safe; batch ingest runs documents on a thread pool,
+# so every use of fitz (directly or via PyMuPDFLoader) goes through this lock.
+_FITZ_LOCK = threading.Lock()
 
 
 @dataclass
@@ -14,7 +18,15 @@ class PdfPage:
     image_path: str         # where the page image is saved (for Streamlit preview)
 
 
-def load_pdf_pages(pdf_path: str, doc_id: str, out_dir: str = "storage/images", dpi: int = 200) -> List[PdfPage]:
+def load_pdf_pages(pdf_path: str, doc_id: str, out_dir: str = IMAGE_OUT_DIR, dpi: int = 200) -> List[PdfPage]:
+    with _FITZ_LOCK:
+        return _load_pdf_pages(pdf_path, doc_id, out_dir, dpi)
+
+
+def _load_pdf_pages(pdf_path: str, doc_id: str, out_dir: str, dpi: int) -> List[PdfPage]:
+    import fitz  # PyMuPDF
+    from langchain_community.document_loaders import PyMuPDFLoader
+
     pdf_path = Path(pdf_path)
 
     # 1) Native text using LangChain loader (per page)
@@ -1,10 +1,20 @@
-from typing import Dict, Any, List
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 
+from rag_app.core.config import DEDUPE_ENABLED, DEDUPE_THRESHOLD, EMBEDDING_STORAGE_FORMAT, MATERIALIZE_ENABLED
 from rag_app.core.ingest.pdf_loader import load_pdf_pages
 from rag_app.core.ingest.extractor import extract_pages_with_ocr
 from rag_app.core.ingest.chunker import chunk_pages
+from rag_app.core.ingest.checkpoint import IngestCheckpoint, chunk_key
+from rag_app.core.ingest.dedupe import dedupe_chunks
 from rag_app.core.ingest.embeddings import embed_texts
-from rag_app.core.storage.mongo import get_collection
+from rag_app.core.rag.chunk_cache import clear_chunk_cache
+from rag_app.core.rag.materialize import rebuild_answers_in_background
+from rag_app.core.storage.mongo import get_collection, get_docs_collection
+from rag_app.core.storage.vectors import encode_vector
+from rag_app.core.utils.metrics import incr, span, start_trace
 
 def ingest_pdf(
     pdf_path: str,
@@ -13,49 +23,156 @@ def ingest_pdf(
     ocr_lang: str = "eng",
     chunk_size: int = 500,
     overlap: int = 50,
+    checkpoint: Optional[IngestCheckpoint] = None,
+    store_batch_size: int = 32,
+    vector_format: str = EMBEDDING_STORAGE_FORMAT,
+    materialize: bool = MATERIALIZE_ENABLED,
+    dedupe: bool = DEDUPE_ENABLED,
 ) -> Dict[str, Any]:
     """
     Ingest a PDF with OCR (mandatory).
     Stores chunks with vectors in MongoDB.
+
+    If a checkpoint is given, OCR'd pages and stored chunks are recorded as
+    they complete, and work already recorded there is skipped on resume.
+    Chunks are embedded and upserted on (tenant_id, doc_id, page_num,
+    chunk_index) in batches of `store_batch_size`, so a batch replayed after
+    a crash overwrites rather than duplicates.
+    Every fresh start (no checkpoint, or one with no stored chunks) gets a new
+    `ingest_version`, stored on its chunks, so caches keyed by it in other
+    processes never serve the old bodies. Chunks of any other version are
+    deleted only after the last batch is stored.
+    Vectors are written in `vector_format` (see rag_app.core.storage.vectors).
+    With `materialize`, stored answers for the document are dropped and
+    rebuilt in the background once the vector index has caught up
+    (see rag_app.core.rag.materialize).
+    With `dedupe`, near-duplicate chunks are collapsed before embedding; the
+    kept chunk lists every page it appeared on in `source_pages`.
     """
 
-    # 1) Load pages as images (+ saved page png paths)
-    pages = load_pdf_pages(pdf_path=pdf_path, doc_id=doc_id)
+    with start_trace() as trace:
+        # 1) Load pages as images (+ saved page png paths)
+        with span("ingest.load_pages"):
+            pages = load_pdf_pages(pdf_path=pdf_path, doc_id=doc_id)
+        incr("ingest_pages", len(pages))
+        incr("ingest_image_bytes", sum(len(p.image_bytes) for p in pages))
+
+        # 2) OCR every page (mandatory)
+        with span("ingest.ocr"):
+            extracted_pages = extract_pages_with_ocr(pages, ocr_lang=ocr_lang, checkpoint=checkpoint)
+
+        # 3) Chunk per page
+        with span("ingest.chunk"):
+            chunks = chunk_pages(extracted_pages, chunk_size=chunk_size, overlap=overlap)
+
+        dedupe_stats: Dict[str, Any] = {"dedupe_ratio": 0.0}
+        if dedupe:
+            with span("ingest.dedupe"):
+                chunks, dedupe_stats = dedupe_chunks(chunks, threshold=DEDUPE_THRESHOLD)
+            incr("ingest_duplicate_chunks", dedupe_stats["duplicates_removed"])
+
+        if checkpoint is not None:
+            pending = [c for c in chunks if chunk_key(c.page_num, c.chunk_index) not in checkpoint.stored_chunks]
+        else:
+            pending = chunks
+
+        col = get_collection()
+        inserted = 0
+
+        if checkpoint is None or not checkpoint.stored_chunks:
+            version = uuid.uuid4().hex[:12]
+        else:
+            version = checkpoint.version or uuid.uuid4().hex[:12]
+        if checkpoint is not None and checkpoint.version != version:
+            checkpoint.mark_version(version)
 
-    # 2) OCR every page (mandatory)
-    extracted_pages = extract_pages_with_ocr(pages, ocr_lang=ocr_lang)
+        # 4) + 5) Embed and store in MongoDB, one batch at a time
+        for i in range(0, len(pending), store_batch_size):
+            batch = pending[i : i + store_batch_size]
 
-    # 3) Chunk per page
-    chunks = chunk_pages(extracted_pages, chunk_size=chunk_size, overlap=overlap)
+            texts = [c.text for c in batch]
+            incr("ingest_text_bytes", sum(len(t.encode("utf-8")) for t in texts))
+            with span("ingest.embed"):
+                vectors = embed_texts(texts)
 
-    # 4) Embeddings
-    texts = [c.text for c in chunks]
-    vectors = embed_texts(texts)
+            with span("ingest.store"):
+                docs_to_insert: List[Dict[str, Any]] = []
+                for c, v in zip(batch, vectors):
+                    docs_to_insert.append(
+                        {
+                            "tenant_id": tenant_id,
+                            "doc_id": doc_id,
+                            "page_num": c.page_num,
+                            "chunk_index": c.chunk_index,
+                            "text": c.text,
+                            "image_path": c.image_path,
+                            "source_pages": c.source_pages or [c.page_num],
+                            "ingest_version": version,
+                            **encode_vector(v, vector_format),
+                        }
+                    )
 
-    # 5) Store in MongoDB
-    col = get_collection()
+                if docs_to_insert:
+                    from pymongo import ReplaceOne
 
-    docs_to_insert: List[Dict[str, Any]] = []
-    for c, v in zip(chunks, vectors):
-        docs_to_insert.append(
+                    col.bulk_write(
+                        [
+                            ReplaceOne(
+                                {k: d[k] for k in ("tenant_id", "doc_id", "page_num", "chunk_index")},
+                                d,
+                                upsert=True,
+                            )
+                            for d in docs_to_insert
+                        ],
+                        ordered=False,
+                    )
+
+            inserted += len(docs_to_insert)
+            if checkpoint is not None:
+                checkpoint.mark_chunks(chunk_key(c.page_num, c.chunk_index) for c in batch)
+
+        incr("ingest_chunks", inserted)
+
+        # Only now drop what the previous version left behind (pages or chunks that no
+        # longer exist), so the document stays answerable for the whole ingest
+        with span("ingest.prune"):
+            pruned = col.delete_many(
+                {"tenant_id": tenant_id, "doc_id": doc_id, "ingest_version": {"$ne": version}}
+            ).deleted_count
+        incr("ingest_pruned_chunks", pruned)
+
+        # Cached chunk bodies for this process may now be stale
+        clear_chunk_cache()
+
+        # Where the source PDF lives, for the page-asset API (manifests allow any pdf_path / doc_id)
+        get_docs_collection().replace_one(
+            {"tenant_id": tenant_id, "doc_id": doc_id},
             {
                 "tenant_id": tenant_id,
                 "doc_id": doc_id,
-                "page_num": c.page_num,
-                "chunk_index": c.chunk_index,
-                "text": c.text,
-                "embedding": v,
-                "image_path": c.image_path,
-            }
+                "pdf_path": str(Path(pdf_path).resolve()),
+                "pages": len(pages),
+                "ingest_version": version,
+                "ingested_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
         )
 
-    if docs_to_insert:
-        col.insert_many(docs_to_insert)
+        if checkpoint is not None:
+            checkpoint.mark_done()
+
+        if materialize:
+            rebuild_answers_in_background(tenant_id, doc_id, ingest_version=version)
 
     return {
         "pdf_path": pdf_path,
         "tenant_id": tenant_id,
         "doc_id": doc_id,
         "pages": len(pages),
-        "chunks_inserted": len(docs_to_insert),
+        "chunks": len(chunks),
+        "chunks_inserted": inserted,
+        "chunks_resumed": len(chunks) - len(pending),
+        "dedupe_ratio": dedupe_stats["dedupe_ratio"],
+        "answers_rebuild": "scheduled" if materialize else "skipped",
+        "timings": trace.as_dict(),
     }
@@ -0,0 +1,207 @@
+# rag_app/core/loadtest/runner.py
+
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rag_app.core.utils.scheduler import TokenBucket
+
+# Synthetic mix used when no recorded questions are given (question, weight)
+SYNTHETIC_MIX = [
+    ("Can you show me the site plan?", 5),
+    ("How many towers are in the project?", 4),
+    ("What are the amenities?", 4),
+    ("What is the possession date?", 3),
+    ("What is the Master bedroom size in Flat no. 2?", 3),
+    ("What is the kitchen size in Flat no. 1?", 2),
+    ("What are the project specifications?", 2),
+    ("Which flooring is used in the living room?", 1),
+    ("Is there a swimming pool and gym?", 1),
+]
+
+
+def load_questions(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Question mix as [{"question", "weight"}]. A file may be JSON Lines
+    ({"question": ..., "weight"?: ...}) or plain text, one question per line.
+    """
+    if not path:
+        return [{"question": q, "weight": w} for q, w in SYNTHETIC_MIX]
+
+    mix: List[Dict[str, Any]] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            entry = json.loads(line)
+            mix.append({"question": entry["question"], "weight": float(entry.get("weight", 1))})
+        else:
+            mix.append({"question": line, "weight": 1.0})
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    v = sorted(values)
+    return {
+        "count": len(v),
+        "mean": round(sum(v) / len(v), 3) if v else 0.0,
+        "p50": round(percentile(v, 50), 3),
+        "p95": round(percentile(v, 95), 3),
+        "p99": round(percentile(v, 99), 3),
+        "max": round(v[-1], 3) if v else 0.0,
+    }
+
+
+@dataclass
+class _Results:
+    latencies_ms: List[float] = field(default_factory=list)
+    stages_ms: Dict[str, List[float]] = field(default_factory=dict)
+    errors_by_stage: Dict[str, int] = field(default_factory=dict)
+    errors_by_type: Dict[str, int] = field(default_factory=dict)
+    ok: int = 0
+    failed: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def run_load(
+    target: Callable[[str], Dict[str, Any]],
+    questions: List[Dict[str, Any]],
+    *,
+    concurrency: int = 8,
+    requests: Optional[int] = 200,
+    duration_s: Optional[float] = None,
+    arrival_rate: Optional[float] = None,
+    think_time_ms: float = 0.0,
+    warmup_requests: int = 0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Closed-loop load: `concurrency` virtual users each send a question, wait for the
+    answer, optionally think, and repeat, until `requests` are done or `duration_s` passes.
+    With `arrival_rate` (req/s), request starts are additionally paced by a shared
+    token bucket, so the offered load cannot exceed that rate.
+
+    Returns throughput, end-to-end latency percentiles, per-stage latency percentiles
+    (from the "timings" each answer carries) and error rates by stage and type.
+    """
+    if requests is None and duration_s is None:
+        raise ValueError("Set requests and/or duration_s")
+
+    rng = random.Random(seed)
+    population = [q["question"] for q in questions]
+    weights = [q.get("weight", 1) for q in questions]
+    plan_lock = threading.Lock()
+    issued = 0
+
+    pacer = TokenBucket(arrival_rate, burst=1) if arrival_rate else None
+    results = _Results()
+
+    def next_question() -> Optional[Tuple[str, bool]]:
+        nonlocal issued
+        with plan_lock:
+            if requests is not None and issued >= requests + warmup_requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            issued += 1
+            return rng.choices(population, weights=weights)[0], issued <= warmup_requests
+
+    def user() -> None:
+        while True:
+            nxt = next_question()
+            if nxt is None:
+                return
+            q, warm = nxt
+
+            if pacer is not None:
+                pacer.acquire()
+
+            start = time.perf_counter()
+            try:
+                res = target(q)
+                elapsed = (time.perf_counter() - start) * 1000.0
+                if warm:
+                    continue
+                with results.lock:
+                    results.ok += 1
+                    results.latencies_ms.append(elapsed)
+                    for stage, ms in (res.get("timings") or {}).items():
+                        if stage != "total":
+                            results.stages_ms.setdefault(stage, []).append(ms)
+            except Exception as e:
+                if warm:
+                    continue
+                stage = getattr(e, "rag_stage", None) or "unknown"
+                with results.lock:
+                    results.failed += 1
+                    results.errors_by_stage[stage] = results.errors_by_stage.get(stage, 0) + 1
+                    name = type(e).__name__
+                    results.errors_by_type[name] = results.errors_by_type.get(name, 0) + 1
+
+            if think_time_ms > 0:
+                time.sleep(think_time_ms / 1000.0)
+
+    started = time.perf_counter()
+    deadline = started + duration_s if duration_s else None
+    threads = [threading.Thread(target=user, name=f"vu-{i}") for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed_s = time.perf_counter() - started
+
+    total = results.ok + results.failed
+    return {
+        "concurrency": concurrency,
+        "arrival_rate": arrival_rate,
+        "requests": total,
+        "ok": results.ok,
+        "failed": results.failed,
+        "error_rate": round(results.failed / total, 4) if total else 0.0,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(results.ok / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+        "latency_ms": _summary(results.latencies_ms),
+        "stages_ms": {stage: _summary(v) for stage, v in sorted(results.stages_ms.items())},
+        "stage_error_rates": {
+            stage: round(n / total, 4) for stage, n in sorted(results.errors_by_stage.items())
+        } if total else {},
+        "errors_by_type": dict(results.errors_by_type),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"requests={report['requests']} ok={report['ok']} failed={report['failed']} "
+        f"error_rate={report['error_rate']:.2%}",
+        f"concurrency={report['concurrency']} arrival_rate={report['arrival_rate'] or 'closed-loop'} "
+        f"elapsed={report['elapsed_s']}s throughput={report['throughput_rps']} req/s",
+        "",
+        f"{'stage':<28}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)",
+    ]
+
+    rows = [("end_to_end", report["latency_ms"])] + list(report["stages_ms"].items())
+    for stage, s in rows:
+        lines.append(f"{stage:<28}{s['count']:>7}{s['p50']:>10}{s['p95']:>10}{s['p99']:>10}{s['max']:>10}")
+
+    if report["stage_error_rates"]:
+        lines.append("")
+        lines.append("errors by stage: " + ", ".join(f"{k}={v:.2%}" for k, v in report["stage_error_rates"].items()))
+        lines.append("errors by type: " + ", ".join(f"{k}={v}" for k, v in report["errors_by_type"].items()))
+
+    return "\n".join(lines)
@@ -0,0 +1,272 @@
+# rag_app/core/loadtest/stubs.py
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from rag_app.core.utils import scheduler
+
+
+class LatencyDist:
+    """
+    Injectable latency distribution, parsed from a spec string (milliseconds):
+      "0" / "fixed:50" / "uniform:20,80" / "normal:100,20" / "lognormal:120,0.5" (median, sigma)
+    """
+
+    def __init__(self, spec: str = "0", seed: Optional[int] = None) -> None:
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        if not args:
+            kind, args = "fixed", kind
+        self.kind = kind
+        self.params = [float(a) for a in args.split(",") if a]
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Bad latency spec {spec!r}")
+
+    def sample_ms(self) -> float:
+        p = self.params
+        with self._lock:
+            if self.kind == "fixed":
+                return p[0]
+            if self.kind == "uniform":
+                return self._rng.uniform(p[0], p[1])
+            if self.kind == "normal":
+                return max(0.0, self._rng.gauss(p[0], p[1]))
+            # lognormal parameterised by median (ms) and sigma
+            return self._rng.lognormvariate(0.0, p[1]) * p[0]
+
+    def sleep(self) -> None:
+        ms = self.sample_ms()
+        if ms > 0:
+            time.sleep(ms / 1000.0)
+
+
+class InjectedError(RuntimeError):
+    pass
+
+
+@dataclass
+class StubBackend:
+    name: str
+    latency: LatencyDist = field(default_factory=LatencyDist)
+    error_rate: float = 0.0
+
+    def hit(self) -> None:
+        self.latency.sleep()
+        if self.error_rate and random.random() < self.error_rate:
+            raise InjectedError(f"injected {self.name} failure")
+
+
+# ----------------------------
+# Synthetic brochure corpus
+# ----------------------------
+_ROOMS = ["M.BEDROOM", "BEDROOM 2", "KITCHEN", "DRAWING", "LIVING & DINING", "TOILET"]
+_TOPICS = [
+    "Tower {t} has 39 floors with four apartments per floor and three high speed elevators.",
+    "Amenities include a clubhouse, swimming pool, gymnasium, jogging track and kids play area.",
+    "Site plan shows {n} towers arranged around a central landscaped podium.",
+    "Possession is expected in December {y} subject to approvals.",
+    "Specifications: vitrified tiles in living areas, UPVC windows, modular kitchen provision.",
+]
+
+
+def synthetic_chunks(tenant_id: str, doc_id: str, pages: int = 40, per_page: int = 4, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    rows: List[Dict[str, Any]] = []
+    for page in range(1, pages + 1):
+        for idx in range(per_page):
+            topic = rng.choice(_TOPICS).format(t=rng.choice("ABCDEF"), n=rng.randint(5, 9), y=rng.randint(2026, 2029))
+            room = rng.choice(_ROOMS)
+            dims = f"{room}\n{rng.randint(10, 16)}' {rng.randint(0, 11)}\" x {rng.randint(10, 16)}' {rng.randint(0, 11)}\""
+            rows.append(
+                {
+                    "_id": f"{doc_id}:{page}:{idx}",
+                    "tenant_id": tenant_id,
+                    "doc_id": doc_id,
+                    "page_num": page,
+                    "chunk_index": idx,
+                    "text": f"[Page {page}]\n{topic}\nFLAT NO. {rng.randint(1, 4)}\n{dims}",
+                    "image_path": f"storage/images/{doc_id}/page_{page}.png",
+                    "source_pages": [page],
+                }
+            )
+    return rows
+
+
+def _project(row: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return dict(row)
+    out = {k: row[k] for k, v in projection.items() if v == 1 and k in row}
+    if projection.get("_id", 1) and "_id" in row:
+        out["_id"] = row["_id"]
+    return out
+
+
+class _Cursor:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows = rows
+
+    def sort(self, key: str, direction: int = 1) -> "_Cursor":
+        self._rows.sort(key=lambda r: r.get(key), reverse=direction < 0)
+        return self
+
+    def limit(self, n: int) -> "_Cursor":
+        if n:
+            self._rows = self._rows[:n]
+        return self
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class StubCollection:
+    """
+    Enough of a pymongo Collection for the query path: $vectorSearch aggregates,
+    find (page lookups / hydration), find_one (materialized answers).
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], search: StubBackend, fetch: StubBackend, materialized_hit_rate: float = 0.0) -> None:
+        self.rows = rows
+        self.by_id = {r["_id"]: r for r in rows}
+        self.search = search
+        self.fetch = fetch
+        self.materialized_hit_rate = materialized_hit_rate
+
+    def aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.search.hit()
+        vs = pipeline[0]["$vectorSearch"]
+        projection = dict(pipeline[1]["$project"]) if len(pipeline) > 1 else None
+        matches = [r for r in self.rows if self._match(r, vs.get("filter", {}))]
+        sample = random.sample(matches, min(vs["limit"], len(matches)))
+
+        out = []
+        for rank, r in enumerate(sample):
+            doc = _project(r, {k: v for k, v in (projection or {}).items() if k != "score"})
+            doc["score"] = 0.95 - rank * 0.01
+            out.append(doc)
+        return out
+
+    def find(self, flt: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> _Cursor:
+        self.fetch.hit()
+        if "_id" in flt:
+            ids = flt["_id"]["$in"]
+            rows = [self.by_id[i] for i in ids if i in self.by_id]
+        else:
+            rows = [r for r in self.rows if self._match(r, flt)]
+        return _Cursor([_project(r, projection) for r in rows])
+
+    def count_documents(self, flt: Dict[str, Any], limit: int = 0) -> int:
+        self.fetch.hit()
+        n = sum(1 for r in self.rows if self._match(r, flt))
+        return min(n, limit) if limit else n
+
+    def find_one(self, flt: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        self.fetch.hit()
+        if random.random() >= self.materialized_hit_rate:
+            return None
+        return {
+            "answer": f"(materialized) {flt.get('question_key', '')}",
+            "citations": [],
+            "image_paths": [],
+            "primary_pdf_link": None,
+        }
+
+    @classmethod
+    def _match(cls, row: Dict[str, Any], flt: Dict[str, Any]) -> bool:
+        for key, value in flt.items():
+            if key == "$or":
+                if not any(cls._match(row, sub) for sub in value):
+                    return False
+            elif isinstance(row.get(key), list):
+                if value not in row[key]:
+                    return False
+            elif row.get(key) != value:
+                return False
+        return True
+
+
+class StubGroq:
+    def __init__(self, llm: StubBackend) -> None:
+        self.llm = llm
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, *, model: str, messages: List[Dict[str, str]], temperature: float = 0.0) -> Any:
+        self.llm.hit()
+        content = "Stub answer (Page 1)."
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@contextmanager
+def stub_backends(
+    *,
+    tenant_id: str = "tenant_01",
+    doc_id: str = "My-Home-Tridasa-E-Brochure",
+    embed: Optional[StubBackend] = None,
+    search: Optional[StubBackend] = None,
+    fetch: Optional[StubBackend] = None,
+    llm: Optional[StubBackend] = None,
+    materialized_hit_rate: float = 0.0,
+    unthrottled: bool = False,
+    embed_dim: int = 384,
+) -> Iterator[StubCollection]:
+    """
+    Swap the embedding service, MongoDB and Groq for in-process stubs with the given
+    latency / error behaviour, for the duration of the block. Everything else
+    (scheduler, caches, reranker, chain logic) runs for real.
+
+    With `unthrottled`, provider rate/concurrency limits are lifted so the stubs'
+    latency is the only constraint.
+    """
+    from rag_app.core.rag import chain, chunk_cache, materialize, retriever
+
+    embed = embed or StubBackend("embed")
+    search = search or StubBackend("search")
+    fetch = fetch or StubBackend("fetch")
+    llm = llm or StubBackend("llm")
+
+    col = StubCollection(synthetic_chunks(tenant_id, doc_id), search, fetch, materialized_hit_rate)
+    groq = StubGroq(llm)
+
+    def embed_query(query: str, retries: int = 5) -> List[float]:
+        return scheduler.get_provider("huggingface").call(
+            lambda: (embed.hit(), [0.0] * embed_dim)[1],
+            key=("embed_query", "stub", query),
+            retries=retries,
+        )
+
+    patches = [
+        (retriever, "get_collection", lambda: col),
+        (retriever, "embed_query", embed_query),
+        (chunk_cache, "get_collection", lambda: col),
+        (materialize, "get_answers_collection", lambda: col),
+        (chain, "get_groq_client", lambda: groq),
+        # chain checks these before calling the client; a stub run must not need real credentials
+        (chain, "GROQ_API_KEY", chain.GROQ_API_KEY or "stub"),
+        (chain, "GROQ_MODEL", chain.GROQ_MODEL or "stub-model"),
+    ]
+    originals = [(mod, name, getattr(mod, name)) for mod, name, _ in patches]
+    saved_providers = dict(scheduler._providers)
+
+    for mod, name, value in patches:
+        setattr(mod, name, value)
+    if unthrottled:
+        for name in ("huggingface", "groq"):
+            scheduler._providers[name] = scheduler.Provider(name, rate_per_sec=1e9, burst=1e9, max_concurrency=10_000)
+    chunk_cache.clear_chunk_cache()
+
+    try:
+        yield col
+    finally:
+        for mod, name, value in originals:
+            setattr(mod, name, value)
+        scheduler._providers.clear()
+        scheduler._providers.update(saved_providers)
+        chunk_cache.clear_chunk_cache()
@@ -1,13 +1,21 @@
-import pytesseract
-from PIL import Image
 import io
+from functools import lru_cache
 
 from rag_app.core.config import TESSERACT_CMD
 
-if TESSERACT_CMD:
-    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+@lru_cache(maxsize=1)
+def _tesseract():
+    # pytesseract / PIL are only needed when OCR actually runs
+    import pytesseract
+
+    if TESSERACT_CMD:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return pytesseract
 
 
 def ocr_image_bytes(image_bytes: bytes, lang: str = "eng") -> str:
+    from PIL import Image
+
     img = Image.open(io.BytesIO(image_bytes))
-    return (pytesseract.image_to_string(img, lang=lang) or "").strip()
+    return (_tesseract().image_to_string(img, lang=lang) or "").strip()
@@ -1,11 +1,54 @@
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from groq import Groq
-
-from rag_app.core.config import GROQ_API_KEY, GROQ_MODEL
+from rag_app.core.config import (
+    GROQ_API_KEY,
+    GROQ_MODEL,
+    MATERIALIZE_ENABLED,
+    RERANK_CANDIDATES,
+    RERANK_ENABLED,
+    RERANK_TOP_N,
+    RETRIEVAL_TWO_PHASE,
+)
+from rag_app.core.rag import reranker
+from rag_app.core.rag.chunk_cache import hydrate_chunks
+from rag_app.core.rag.materialize import lookup_answer
 from rag_app.core.rag.retriever import retrieve_chunks, retrieve_page_chunks
-from rag_app.core.utils.links import pdf_page_file_url
+from rag_app.core.utils.links import page_image_url, pdf_page_file_url
 from rag_app.core.rag.dimensions import is_dimension_question, best_dimension_from_retrieved
+from rag_app.core.utils.metrics import span, start_trace
+from rag_app.core.utils.scheduler import get_provider
+
+
+if TYPE_CHECKING:
+    from groq import Groq
+
+
+@lru_cache(maxsize=1)
+def get_groq_client() -> "Groq":
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY is not set in .env")
+
+    from groq import Groq
+
+    return Groq(api_key=GROQ_API_KEY)
+
+
+def _cited_page(row: Dict[str, Any]) -> Optional[int]:
+    # Page-scoped retrieval cites the requested page; otherwise the page the chunk is stored under
+    return row.get("cited_page", row.get("page_num"))
+
+
+def _cited_image(row: Dict[str, Any]) -> Optional[str]:
+    """
+    Page image for the cited page (renders sit side by side as page_<n>.png).
+    """
+    img = row.get("image_path")
+    page = _cited_page(row)
+    if img and page is not None and page != row.get("page_num"):
+        return str(Path(img).with_name(f"page_{page}.png"))
+    return img
 
 
 def answer_question(
@@ -17,34 +60,105 @@ def answer_question(
     index_name: str = "vector_index",
     page_num: Optional[int] = None,
     chat_history: Optional[List[Dict[str, str]]] = None,
+    rerank: Optional[bool] = None,
+    use_materialized: bool = True,
 ) -> Dict[str, Any]:
     """
     Main RAG chain to answer user questions with strict formatting rules.
+    Per-stage timings (ms) are returned under "timings".
+
+    With reranking (RERANK_ENABLED, or rerank=True), RERANK_CANDIDATES chunks are
+    retrieved and only the best min(k, RERANK_TOP_N) by cross-encoder score are used.
+
+    Questions precomputed at ingest (see rag_app.core.rag.materialize) are answered
+    from the stored table with no model calls; the result then has "materialized": True.
     """
+    with start_trace() as trace:
+        res = None
+        if use_materialized and MATERIALIZE_ENABLED and doc_id and page_num is None:
+            res = _materialized_result(question, tenant_id=tenant_id, doc_id=doc_id)
+
+        if res is None:
+            res = _answer_question(
+                question,
+                tenant_id=tenant_id,
+                doc_id=doc_id,
+                k=k,
+                index_name=index_name,
+                page_num=page_num,
+                chat_history=chat_history,
+                rerank=RERANK_ENABLED if rerank is None else rerank,
+            )
 
+    res["timings"] = trace.as_dict()
+    return res
+
+
+def _materialized_result(question: str, *, tenant_id: str, doc_id: str) -> Optional[Dict[str, Any]]:
+    hit = lookup_answer(question, tenant_id=tenant_id, doc_id=doc_id)
+    if not hit:
+        return None
+
+    return {
+        "answer": hit["answer"],
+        "citations": hit.get("citations", []),
+        "image_paths": hit.get("image_paths", []),
+        "primary_pdf_link": hit.get("primary_pdf_link"),
+        "retrieved": [],
+        "materialized": True,
+    }
+
+
+def _answer_question(
+    question: str,
+    *,
+    tenant_id: str,
+    doc_id: Optional[str],
+    k: int,
+    index_name: str,
+    page_num: Optional[int],
+    chat_history: Optional[List[Dict[str, str]]],
+    rerank: bool,
+) -> Dict[str, Any]:
     # -------------------------
     # 1) Retrieve
     # -------------------------
+    search_k = max(k, RERANK_CANDIDATES) if rerank else k
+
     if page_num is not None:
         if not doc_id:
             raise ValueError("doc_id is required when page_num is provided")
 
-        retrieved = retrieve_page_chunks(
-            question,
-            tenant_id=tenant_id,
-            doc_id=doc_id,
-            page_num=page_num,
-            k=k,
-            index_name=index_name,
-        )
+        with span("answer.retrieve"):
+            retrieved = retrieve_page_chunks(
+                question,
+                tenant_id=tenant_id,
+                doc_id=doc_id,
+                page_num=page_num,
+                k=search_k,
+                index_name=index_name,
+                fetch_text=not RETRIEVAL_TWO_PHASE,
+            )
     else:
-        retrieved = retrieve_chunks(
-            question,
-            tenant_id=tenant_id,
-            doc_id=doc_id,
-            k=k,
-            index_name=index_name,
-        )
+        with span("answer.retrieve"):
+            retrieved = retrieve_chunks(
+                question,
+                tenant_id=tenant_id,
+                doc_id=doc_id,
+                k=search_k,
+                index_name=index_name,
+                fetch_text=not RETRIEVAL_TWO_PHASE,
+            )
+
+    # Two-phase: drop duplicate hits, then fetch bodies (LRU first, batched $in for misses)
+    if RETRIEVAL_TWO_PHASE:
+        with span("answer.hydrate"):
+            retrieved = hydrate_chunks(retrieved)
+
+    # Optional cross-encoder pass: keep only the best few candidates for the prompt
+    if rerank:
+        with span("answer.rerank"):
+            retrieved = reranker.rerank(question, retrieved, top_n=min(k, RERANK_TOP_N))
 
     # -------------------------
     # 2) Build context + citations
@@ -57,14 +171,17 @@ def answer_question(
     def build_pdf_link(page: Optional[int]) -> Optional[str]:
         if page is None or not doc_id:
             return None
-        return pdf_page_file_url(doc_id, int(page))
+        return pdf_page_file_url(tenant_id, doc_id, int(page))
 
     for r in retrieved:
-        page = r.get("page_num")
-        img = r.get("image_path")
+        page = _cited_page(r)
+        img = _cited_image(r)
         txt = (r.get("text") or "").strip()
 
-        context_blocks.append(f"[SOURCE: Page {page}]\n{txt}\n[END SOURCE]")
+        source_pages = r.get("source_pages") or [page]
+        pages_label = ", ".join(str(p) for p in source_pages)
+        label = f"Page {pages_label}" if len(source_pages) == 1 else f"Pages {pages_label}"
+        context_blocks.append(f"[SOURCE: {label}]\n{txt}\n[END SOURCE]")
 
         pdf_link = build_pdf_link(page)
 
@@ -74,9 +191,13 @@ def answer_question(
         citations.append(
             {
                 "page_num": page,
+                "chunk_page": r.get("page_num"),
                 "chunk_index": r.get("chunk_index"),
+                "source_pages": source_pages,
                 "score": r.get("score"),
+                "rerank_score": r.get("rerank_score"),
                 "image_path": img,
+                "image_url": page_image_url(tenant_id, doc_id, int(page)) if doc_id and page is not None else None,
                 "pdf_link": pdf_link,
             }
         )
@@ -88,13 +209,14 @@ def answer_question(
     # 3) DIMENSION MODE (Specialized extraction)
     # -------------------------
     if is_dimension_question(question):
-        found = best_dimension_from_retrieved(retrieved, question)
+        with span("answer.dimensions"):
+            found = best_dimension_from_retrieved(retrieved, question)
 
         if found:
             dim, row = found
-            page = row.get("page_num")
+            page = _cited_page(row)
             pdf_link = build_pdf_link(page)
-            img = row.get("image_path")
+            img = _cited_image(row)
 
             answer = f'The {dim["room"]} dimension is {dim["value"]} (Page {page}).'
 
@@ -140,12 +262,18 @@ FINAL ANSWER (Paragraph form, Direct and Factual):
     if not GROQ_MODEL:
         raise ValueError("GROQ_MODEL is not set in .env")
 
-    client = Groq(api_key=GROQ_API_KEY)
-    resp = client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.0,
-    )
+    with span("answer.llm"):
+        client = get_groq_client()
+        # Identical prompts in flight at the same time share one completion
+        resp = get_provider("groq").call(
+            lambda: client.chat.completions.create(
+                model=GROQ_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0,
+            ),
+            key=("chat", GROQ_MODEL, prompt),
+            retries=3,
+        )
 
     answer = resp.choices[0].message.content.strip()
 
@@ -0,0 +1,94 @@
+# rag_app/core/rag/chunk_cache.py
+
+from typing import Any, Dict, List, Tuple
+
+from rag_app.core.config import CHUNK_CACHE_SIZE
+from rag_app.core.storage.mongo import get_collection
+from rag_app.core.utils.lru import LRUCache
+from rag_app.core.utils.metrics import incr, span
+
+# (tenant_id, doc_id, page_num, chunk_index, ingest_version). The version changes on every
+# fresh ingest, so a re-ingest run by another process never hits bodies cached here.
+ChunkKey = Tuple[str, str, int, int, str]
+
+# Fields that identify a chunk; every query that feeds the cache must project them
+KEY_FIELDS = ("tenant_id", "doc_id", "page_num", "chunk_index", "ingest_version")
+
+# Fields that make up a chunk "body" (everything the chain needs besides the key and score)
+BODY_FIELDS = ("text", "image_path", "source_pages")
+
+_cache: LRUCache[Dict[str, Any]] = LRUCache("chunk_cache", max_items=CHUNK_CACHE_SIZE)
+
+
+def chunk_key(row: Dict[str, Any]) -> ChunkKey:
+    return tuple(row.get(f) for f in KEY_FIELDS)
+
+
+def cache_chunk(row: Dict[str, Any]) -> None:
+    _cache.put(chunk_key(row), {f: row.get(f) for f in BODY_FIELDS})
+
+
+def clear_chunk_cache() -> None:
+    _cache.clear()
+
+
+def hydrate_chunks(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Second phase of two-phase retrieval: attach chunk bodies to id/score rows.
+
+    Duplicate keys are dropped (first, i.e. best-scored, wins). Bodies come from the
+    in-process LRU; misses are fetched in a single batched `$in` query on `_id`.
+    Rows whose chunk is gone by then (pruned by a concurrent re-ingest) are dropped
+    and counted in `chunk_fetch_missing`.
+    """
+    unique: List[Dict[str, Any]] = []
+    seen = set()
+    for r in rows:
+        key = chunk_key(r)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(r)
+
+    missing: Dict[Any, Dict[str, Any]] = {}
+    for r in unique:
+        if "text" in r:
+            continue
+        body = _cache.get(chunk_key(r))
+        if body is not None:
+            r.update(body)
+        else:
+            missing[r["_id"]] = r
+
+    if missing:
+        incr("chunk_fetches", len(missing))
+        projection = {f: 1 for f in BODY_FIELDS}
+        with span("retrieve.fetch_chunks"):
+            for doc in get_collection().find({"_id": {"$in": list(missing)}}, projection):
+                r = missing[doc["_id"]]
+                r.update({f: doc.get(f) for f in BODY_FIELDS})
+                cache_chunk(r)
+
+        lost = [r for r in missing.values() if "text" not in r]
+        if lost:
+            incr("chunk_fetch_missing", len(lost))
+            unique = [r for r in unique if "text" in r]
+
+    for r in unique:
+        r.pop("_id", None)
+
+    return unique
+
+
+def prime_chunk_cache(tenant_id: str, doc_id: str, limit: int = CHUNK_CACHE_SIZE) -> int:
+    """
+    Load a document's chunk bodies into the LRU (e.g. at warm-up). Returns the number cached.
+    """
+    projection = {"_id": 0, **{f: 1 for f in KEY_FIELDS}, **{f: 1 for f in BODY_FIELDS}}
+    cursor = get_collection().find({"tenant_id": tenant_id, "doc_id": doc_id}, projection).limit(limit)
+
+    count = 0
+    for doc in cursor:
+        cache_chunk(doc)
+        count += 1
+    return count
@@ -0,0 +1,176 @@
+# rag_app/core/rag/materialize.py
+
+import json
+import logging
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rag_app.core.config import MATERIALIZE_INDEX_WAIT_S, MATERIALIZE_QUESTIONS_PATH
+from rag_app.core.storage.mongo import get_answers_collection
+from rag_app.core.utils.metrics import incr, span
+from rag_app.core.utils.scheduler import BACKGROUND, lane
+
+logger = logging.getLogger(__name__)
+
+# The brochure questions that dominate traffic
+DEFAULT_QUESTIONS = [
+    "Can you show me the site plan?",
+    "How many towers are in the project?",
+    "What are the amenities?",
+    "What are the flat sizes?",
+    "What is the possession date?",
+]
+
+# Words that do not change what is being asked ("can you show me the ..." == "site plan")
+_STOPWORDS = {
+    "a", "about", "all", "an", "and", "any", "are", "can", "could", "do", "does", "for", "give",
+    "i", "in", "is", "it", "know", "list", "me", "my", "of", "on", "please", "project", "see",
+    "show", "tell", "the", "there", "this", "to", "want", "what", "whats", "which", "would", "you",
+}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Rebuilds run one at a time, off the request path
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="materialize")
+
+
+def question_key(question: str) -> str:
+    """
+    Normalize a question for lookup: lowercase, drop punctuation and filler words,
+    sort the remaining terms.
+    """
+    tokens = _TOKEN_RE.findall((question or "").lower().replace("'", ""))
+    return " ".join(sorted({t for t in tokens if t not in _STOPWORDS}))
+
+
+def questions_for_doc(doc_id: str) -> List[str]:
+    """
+    Question set for a document: MATERIALIZE_QUESTIONS_PATH entry for the doc_id,
+    else its "*" entry, else DEFAULT_QUESTIONS.
+    """
+    if MATERIALIZE_QUESTIONS_PATH and Path(MATERIALIZE_QUESTIONS_PATH).exists():
+        data = json.loads(Path(MATERIALIZE_QUESTIONS_PATH).read_text(encoding="utf-8"))
+        if doc_id in data:
+            return list(data[doc_id])
+        if "*" in data:
+            return list(data["*"])
+    return list(DEFAULT_QUESTIONS)
+
+
+def lookup_answer(question: str, *, tenant_id: str, doc_id: str) -> Optional[Dict[str, Any]]:
+    key = question_key(question)
+    if not key:
+        return None
+
+    with span("answer.materialized_lookup"):
+        row = get_answers_collection().find_one(
+            {"tenant_id": tenant_id, "doc_id": doc_id, "question_key": key},
+            {"_id": 0},
+        )
+
+    incr("materialized_hits" if row else "materialized_misses")
+    return row
+
+
+def invalidate_answers(tenant_id: str, doc_id: str) -> int:
+    return get_answers_collection().delete_many({"tenant_id": tenant_id, "doc_id": doc_id}).deleted_count
+
+
+def materialize_answers(
+    tenant_id: str,
+    doc_id: str,
+    questions: Optional[List[str]] = None,
+    k: int = 15,
+) -> Dict[str, Any]:
+    """
+    Answer each question with the live chain and store answer, citations and
+    image paths next to the chunks. Model calls run in the scheduler's background lane.
+
+    An answer built from no retrieved chunks is not stored: it would be served
+    with zero model calls until the next re-ingest.
+    """
+    from rag_app.core.rag.chain import answer_question  # chain imports this module
+
+    questions = questions if questions is not None else questions_for_doc(doc_id)
+    col = get_answers_collection()
+    stored = 0
+    skipped: List[str] = []
+    errors: List[Dict[str, str]] = []
+
+    with lane(BACKGROUND):
+        for q in questions:
+            try:
+                res = answer_question(q, tenant_id=tenant_id, doc_id=doc_id, k=k, use_materialized=False)
+            except Exception as e:
+                errors.append({"question": q, "error": str(e)})
+                incr("materialized_errors")
+                logger.warning("Materialize failed for %r / %r: %s", doc_id, q, e)
+                continue
+
+            if not res.get("retrieved"):
+                skipped.append(q)
+                incr("materialized_skipped_empty")
+                continue
+
+            key = question_key(q)
+            col.replace_one(
+                {"tenant_id": tenant_id, "doc_id": doc_id, "question_key": key},
+                {
+                    "tenant_id": tenant_id,
+                    "doc_id": doc_id,
+                    "question_key": key,
+                    "question": q,
+                    "answer": res["answer"],
+                    "citations": res["citations"],
+                    "image_paths": res["image_paths"],
+                    "primary_pdf_link": res["primary_pdf_link"],
+                    "created_at": datetime.now(timezone.utc),
+                },
+                upsert=True,
+            )
+            stored += 1
+
+    incr("materialized_answers", stored)
+    return {"tenant_id": tenant_id, "doc_id": doc_id, "stored": stored, "skipped_empty": skipped, "errors": errors}
+
+
+def _rebuild(
+    tenant_id: str,
+    doc_id: str,
+    ingest_version: Optional[str],
+    questions: Optional[List[str]],
+    index_wait_s: float,
+) -> Dict[str, Any]:
+    if ingest_version is not None:
+        from rag_app.core.storage.indexes import wait_for_vector_index  # pulls in pymongo
+
+        with span("materialize.index_wait"):
+            ready = wait_for_vector_index(tenant_id, doc_id, ingest_version, timeout_s=index_wait_s)
+        if not ready:
+            # Answers stay invalidated; questions are answered live until the next ingest
+            incr("materialized_index_timeouts")
+            logger.warning("Vector index not caught up for %s/%s; skipping answer rebuild", tenant_id, doc_id)
+            return {"tenant_id": tenant_id, "doc_id": doc_id, "stored": 0, "index_ready": False}
+
+    return materialize_answers(tenant_id, doc_id, questions)
+
+
+def rebuild_answers_in_background(
+    tenant_id: str,
+    doc_id: str,
+    questions: Optional[List[str]] = None,
+    *,
+    ingest_version: Optional[str] = None,
+    index_wait_s: float = MATERIALIZE_INDEX_WAIT_S,
+) -> Future:
+    """
+    Drop the stale answers for a re-ingested document now, then rebuild them in the background.
+
+    With `ingest_version`, the rebuild first waits (up to `index_wait_s`) until the
+    vector index returns every chunk of that version, so answers are never built
+    from an empty or partial index.
+    """
+    invalidate_answers(tenant_id, doc_id)
+    return _executor.submit(_rebuild, tenant_id, doc_id, ingest_version, questions, index_wait_s)
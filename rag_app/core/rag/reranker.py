@@ -0,0 +1,101 @@
+# rag_app/core/rag/reranker.py
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from rag_app.core.config import RERANK_BUDGET_MS, RERANK_CACHE_SIZE, RERANK_MODEL
+from rag_app.core.rag.chunk_cache import chunk_key
+from rag_app.core.utils.lru import LRUCache
+from rag_app.core.utils.metrics import incr, span
+
+logger = logging.getLogger(__name__)
+
+# One scoring thread: CPU forward passes are serialized, callers wait with a timeout
+_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+_score_cache: LRUCache[float] = LRUCache("rerank_cache", max_items=RERANK_CACHE_SIZE)
+
+
+@lru_cache(maxsize=1)
+def get_reranker():
+    # Imported here: sentence-transformers pulls in torch, which is only needed when reranking is on
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(RERANK_MODEL, device="cpu")
+
+
+def _score_pairs(pairs: List[Tuple[str, str]], deadline: float) -> Optional[List[float]]:
+    # A job that waited in the queue past its caller's budget is dropped:
+    # nobody is waiting for it, and running it would delay every later request
+    if time.monotonic() > deadline:
+        incr("rerank_expired")
+        return None
+
+    # Single batched forward pass over all uncached (query, chunk) pairs
+    scores = get_reranker().predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+    return [float(s) for s in scores]
+
+
+def _cache_scores(keys: Sequence[Any], fut: Future) -> None:
+    if fut.cancelled() or fut.exception() is not None or fut.result() is None:
+        return
+    for key, score in zip(keys, fut.result()):
+        _score_cache.put(key, score)
+
+
+def rerank(
+    query: str,
+    rows: List[Dict[str, Any]],
+    *,
+    top_n: int = 5,
+    budget_ms: float = RERANK_BUDGET_MS,
+) -> List[Dict[str, Any]]:
+    """
+    Re-order retrieved chunks with a local cross-encoder and keep the best `top_n`.
+
+    Scores are cached per (query, chunk). If scoring does not finish within
+    `budget_ms` (e.g. the model is still loading), the vector-search order is
+    kept. A job that already started still completes in the background and
+    fills the cache; one still queued is cancelled, so abandoned work cannot
+    pile up behind the single scoring thread.
+    """
+    if not rows:
+        return rows
+
+    keys = [(query, chunk_key(r)) for r in rows]
+    scores: List[Optional[float]] = [_score_cache.get(key) for key in keys]
+    missing = [i for i, s in enumerate(scores) if s is None]
+
+    if missing:
+        pairs = [(query, rows[i].get("text") or "") for i in missing]
+        missing_keys = [keys[i] for i in missing]
+
+        with span("rerank.score"):
+            deadline = time.monotonic() + budget_ms / 1000.0
+            fut = _pool.submit(_score_pairs, pairs, deadline)
+            fut.add_done_callback(lambda f: _cache_scores(missing_keys, f))
+            try:
+                new_scores = fut.result(timeout=budget_ms / 1000.0)
+            except TimeoutError:
+                new_scores = None
+                if fut.cancel():
+                    incr("rerank_cancelled")
+            except Exception as e:
+                incr("rerank_errors")
+                logger.warning("Rerank failed, keeping vector order: %s", e)
+                return rows[:top_n]
+
+            if new_scores is None:
+                incr("rerank_budget_exceeded")
+                return rows[:top_n]
+
+        for i, s in zip(missing, new_scores):
+            scores[i] = s
+
+    for r, s in zip(rows, scores):
+        r["rerank_score"] = s
+
+    ranked = sorted(rows, key=lambda r: r["rerank_score"], reverse=True)
+    return ranked[:top_n]
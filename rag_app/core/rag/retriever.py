@@ -1,6 +1,43 @@
+import re
 from typing import Any, Dict, List, Optional
+
+from rag_app.core.config import PAGE_DIRECT_MAX_CHUNKS
 from rag_app.core.storage.mongo import get_collection
 from rag_app.core.ingest.embeddings import embed_query
+from rag_app.core.rag.chunk_cache import cache_chunk
+from rag_app.core.storage.vectors import cosine_scores, decode_vector
+from rag_app.core.utils.metrics import span
+
+
+def _result_projection(fetch_text: bool) -> Dict[str, Any]:
+    """
+    With fetch_text=False only ids and scores come back (phase one of two-phase
+    retrieval); bodies are attached later by chunk_cache.hydrate_chunks.
+    """
+    projection: Dict[str, Any] = {
+        "_id": 0,
+        "tenant_id": 1,
+        "doc_id": 1,
+        "page_num": 1,
+        "chunk_index": 1,
+        "ingest_version": 1,
+        "score": {"$meta": "vectorSearchScore"},
+    }
+    if fetch_text:
+        projection.update({"text": 1, "image_path": 1, "source_pages": 1})
+    else:
+        projection["_id"] = 1
+    return projection
+
+
+def _run_search(col, pipeline: List[Dict[str, Any]], fetch_text: bool) -> List[Dict[str, Any]]:
+    with span("retrieve.vector_search"):
+        rows = list(col.aggregate(pipeline))
+
+    if fetch_text:
+        for r in rows:
+            cache_chunk(r)
+    return rows
 
 
 def retrieve_chunks(
@@ -11,9 +48,24 @@ def retrieve_chunks(
     k: int = 5,
     index_name: str = "vector_index",
     num_candidates: int = 100,
+    rescore: bool = False,
+    rescore_pool: Optional[int] = None,
+    fetch_text: bool = True,
 ) -> List[Dict[str, Any]]:
+    """
+    Vector search over a tenant's (optionally one doc's) chunks.
+
+    With `rescore`, the top `rescore_pool` hits (default k) are re-ranked locally
+    by exact cosine similarity against the stored vectors (list or packed formats)
+    and trimmed to k.
+
+    With fetch_text=False, rows carry only `_id`, key fields and score.
+    """
     col = get_collection()
-    qvec = embed_query(query)
+    with span("retrieve.embed_query"):
+        qvec = embed_query(query)
+
+    limit = max(k, rescore_pool or k) if rescore else k
 
     flt: Dict[str, Any] = {"tenant_id": tenant_id}
     if doc_id:
@@ -25,26 +77,44 @@ def retrieve_chunks(
                 "index": index_name,
                 "path": "embedding",
                 "queryVector": qvec,
-                "numCandidates": num_candidates,
-                "limit": k,
+                "numCandidates": max(num_candidates, limit),
+                "limit": limit,
                 "filter": flt,
             }
         },
-        {
-            "$project": {
-                "_id": 0,
-                "tenant_id": 1,
-                "doc_id": 1,
-                "page_num": 1,
-                "chunk_index": 1,
-                "text": 1,
-                "image_path": 1,
-                "score": {"$meta": "vectorSearchScore"},
-            }
-        },
+        {"$project": _result_projection(fetch_text)},
     ]
 
-    return list(col.aggregate(pipeline))
+    if rescore:
+        pipeline[1]["$project"].update({"embedding": 1, "embedding_format": 1, "embedding_scale": 1, "embedding_f16": 1})
+
+    rows = _run_search(col, pipeline, fetch_text)
+
+    if rescore:
+        with span("retrieve.rescore"):
+            rows = rescore_rows(qvec, rows)[:k]
+
+    return rows
+
+
+def rescore_rows(qvec: List[float], rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Replace each row's score with exact cosine similarity computed from its stored
+    vector, sort by it, and drop the vector fields from the rows.
+    """
+    with_vec = [r for r in rows if r.get("embedding") is not None]
+    scores = cosine_scores(qvec, [decode_vector(r) for r in with_vec])
+
+    for r, s in zip(with_vec, scores):
+        r["score"] = float(s)
+
+    for r in rows:
+        r.pop("embedding", None)
+        r.pop("embedding_format", None)
+        r.pop("embedding_scale", None)
+        r.pop("embedding_f16", None)
+
+    return sorted(rows, key=lambda r: r.get("score") or 0.0, reverse=True)
 
 
 def retrieve_page_chunks(
@@ -56,9 +126,45 @@ def retrieve_page_chunks(
     k: int = 5,
     index_name: str = "vector_index",
     num_candidates: int = 100,
+    fetch_text: bool = True,
+    direct_max_chunks: int = PAGE_DIRECT_MAX_CHUNKS,
 ) -> List[Dict[str, Any]]:
+    """
+    Chunks of one page. Small pages (<= direct_max_chunks chunks) are read with an
+    index-backed find on (tenant_id, doc_id, page_num, chunk_index) and ranked in
+    memory by term overlap, with no embedding call. Larger pages fall back to
+    filtered vector search. The page size is checked with an index-only count
+    first, so no chunk bodies are read for pages that go to vector search.
+
+    Every row gets `cited_page` = page_num, the page citations and images should
+    show; a de-duplicated chunk stored under another page keeps its stored
+    page_num/chunk_index, which caches and de-duplication key on.
+    """
     col = get_collection()
-    qvec = embed_query(query)
+
+    # A de-duplicated chunk belongs to every page listed in source_pages
+    on_page = {"$or": [{"page_num": page_num}, {"source_pages": page_num}]}
+    flt = {"tenant_id": tenant_id, "doc_id": doc_id, **on_page}
+
+    with span("retrieve.page_count"):
+        page_chunks = col.count_documents(flt, limit=direct_max_chunks + 1)
+
+    if page_chunks <= direct_max_chunks:
+        with span("retrieve.page_fetch"):
+            docs = list(
+                col.find(
+                    flt,
+                    {"_id": 0, "tenant_id": 1, "doc_id": 1, "page_num": 1, "chunk_index": 1, "ingest_version": 1, "text": 1, "image_path": 1, "source_pages": 1},
+                )
+                .sort("chunk_index", 1)
+                .limit(direct_max_chunks)
+            )
+        for d in docs:
+            cache_chunk(d)
+        return _cite_page(_rank_by_terms(query, docs)[:k], page_num)
+
+    with span("retrieve.embed_query"):
+        qvec = embed_query(query)
 
     pipeline = [
         {
@@ -68,25 +174,30 @@ def retrieve_page_chunks(
                 "queryVector": qvec,
                 "numCandidates": num_candidates,
                 "limit": k,
-                "filter": {
-                    "tenant_id": tenant_id,
-                    "doc_id": doc_id,
-                    "page_num": page_num,
-                },
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "tenant_id": 1,
-                "doc_id": 1,
-                "page_num": 1,
-                "chunk_index": 1,
-                "text": 1,
-                "image_path": 1,
-                "score": {"$meta": "vectorSearchScore"},
+                "filter": flt,
             }
         },
+        {"$project": _result_projection(fetch_text)},
     ]
 
-    return list(col.aggregate(pipeline))
+    return _cite_page(_run_search(col, pipeline, fetch_text), page_num)
+
+
+def _cite_page(rows: List[Dict[str, Any]], page_num: int) -> List[Dict[str, Any]]:
+    for r in rows:
+        r["cited_page"] = page_num
+    return rows
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _rank_by_terms(query: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Score rows by the fraction of query terms found in their text; ties keep chunk order.
+    """
+    terms = set(_TOKEN_RE.findall(query.lower()))
+    for r in rows:
+        words = set(_TOKEN_RE.findall((r.get("text") or "").lower()))
+        r["score"] = len(terms & words) / len(terms) if terms else 0.0
+    return sorted(rows, key=lambda r: r["score"], reverse=True)
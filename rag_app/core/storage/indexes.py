@@ -0,0 +1,190 @@
+# rag_app/core/storage/indexes.py
+
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from pymongo.operations import SearchIndexModel
+
+from rag_app.core.config import EMBED_DIM
+from rag_app.core.storage.mongo import get_answers_collection, get_collection, get_docs_collection
+
+# B-tree index backing page lookups, chunk hydration by key and per-doc deletes.
+# Unique: ingest upserts on this key, so a replayed batch cannot duplicate chunks.
+CHUNK_KEY_INDEX = IndexModel(
+    [("tenant_id", ASCENDING), ("doc_id", ASCENDING), ("page_num", ASCENDING), ("chunk_index", ASCENDING)],
+    name="tenant_doc_page_chunk",
+    unique=True,
+)
+# Multikey index for page lookups that match de-duplicated chunks via source_pages
+CHUNK_SOURCE_PAGES_INDEX = IndexModel(
+    [("tenant_id", ASCENDING), ("doc_id", ASCENDING), ("source_pages", ASCENDING)],
+    name="tenant_doc_source_pages",
+)
+CHUNK_INDEXES: List[IndexModel] = [CHUNK_KEY_INDEX, CHUNK_SOURCE_PAGES_INDEX]
+
+# Materialized answers are looked up (and upserted) by normalized question
+ANSWER_INDEXES: List[IndexModel] = [
+    IndexModel(
+        [("tenant_id", ASCENDING), ("doc_id", ASCENDING), ("question_key", ASCENDING)],
+        name="tenant_doc_question",
+        unique=True,
+    )
+]
+
+# Document records: one per (tenant, doc); the page-asset API resolves source PDFs by doc_id
+DOC_INDEXES: List[IndexModel] = [
+    IndexModel([("tenant_id", ASCENDING), ("doc_id", ASCENDING)], name="tenant_doc", unique=True),
+]
+
+# Fields used in $vectorSearch "filter" clauses; each must be declared in the vector index
+VECTOR_FILTER_FIELDS = ["tenant_id", "doc_id", "page_num", "source_pages", "ingest_version"]
+
+
+def vector_index_definition(num_dimensions: int = EMBED_DIM, similarity: str = "cosine") -> Dict[str, Any]:
+    return {
+        "fields": [
+            {
+                "type": "vector",
+                "path": "embedding",
+                "numDimensions": num_dimensions,
+                "similarity": similarity,
+            },
+            *[{"type": "filter", "path": f} for f in VECTOR_FILTER_FIELDS],
+        ]
+    }
+
+
+def ensure_indexes(col=None, models: Optional[List[IndexModel]] = None) -> Dict[str, Any]:
+    """
+    Create B-tree indexes (default: the ones chunk queries depend on; no-op if
+    they exist) and verify their key patterns and uniqueness.
+
+    An existing index with the same name but different options (e.g. created
+    before it became unique) is dropped and rebuilt. If the rebuild fails
+    (duplicate keys already stored), the error is reported, not raised.
+    """
+    col = col if col is not None else get_collection()
+    models = models if models is not None else CHUNK_INDEXES
+
+    existing = col.index_information()
+    report: Dict[str, Any] = {}
+    for model in models:
+        spec = model.document
+        name = spec["name"]
+        found = existing.get(name)
+        if found and bool(found.get("unique")) != bool(spec.get("unique")):
+            col.drop_index(name)
+            found = None
+
+        if not found:
+            try:
+                col.create_indexes([model])
+            except OperationFailure as e:
+                report[name] = f"error: {e}"
+                continue
+            found = col.index_information().get(name)
+
+        expected = list(spec["key"].items())
+        report[name] = "ok" if found and list(found["key"]) == expected else "mismatch"
+    return report
+
+
+def ensure_vector_index(col=None, name: str = "vector_index", definition: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Create the Atlas vector search index if missing, or update it when filter
+    fields are missing from its definition. Returns what was done.
+    """
+    col = col if col is not None else get_collection()
+    definition = definition or vector_index_definition()
+
+    existing = list(col.list_search_indexes(name))
+    if not existing:
+        col.create_search_index(SearchIndexModel(definition=definition, name=name, type="vectorSearch"))
+        return "created"
+
+    current = existing[0].get("latestDefinition", {})
+    current_filters = {f.get("path") for f in current.get("fields", []) if f.get("type") == "filter"}
+    missing = [f for f in VECTOR_FILTER_FIELDS if f not in current_filters]
+    if missing:
+        col.update_search_index(name, definition)
+        return f"updated (added filters: {', '.join(missing)})"
+    return "ok"
+
+
+def bootstrap_storage(index_name: str = "vector_index") -> Dict[str, Any]:
+    """
+    Declare and verify every index the app relies on.
+    Vector index management needs Atlas; on other deployments the error is reported, not raised.
+    """
+    col = get_collection()
+    report: Dict[str, Any] = {
+        "indexes": ensure_indexes(col),
+        "answer_indexes": ensure_indexes(get_answers_collection(), ANSWER_INDEXES),
+        "doc_indexes": ensure_indexes(get_docs_collection(), DOC_INDEXES),
+    }
+    try:
+        report["vector_index"] = ensure_vector_index(col, name=index_name)
+    except OperationFailure as e:
+        report["vector_index"] = f"error: {e}"
+    return report
+
+
+def vector_index_caught_up(col, tenant_id: str, doc_id: str, ingest_version: str, index_name: str = "vector_index") -> bool:
+    """
+    True once $vectorSearch sees every chunk stored for this ingest version.
+    Atlas indexes new documents asynchronously, so right after an ingest a
+    filtered search can return none or only some of them.
+    """
+    from rag_app.core.storage.vectors import decode_vector
+
+    flt = {"tenant_id": tenant_id, "doc_id": doc_id, "ingest_version": ingest_version}
+    stored = col.count_documents(flt)
+    if stored == 0:
+        return False
+
+    probe = col.find_one(flt, {"embedding": 1, "embedding_format": 1, "embedding_scale": 1})
+    limit = min(stored, 10_000)
+    rows = list(
+        col.aggregate(
+            [
+                {
+                    "$vectorSearch": {
+                        "index": index_name,
+                        "path": "embedding",
+                        "queryVector": decode_vector(probe).tolist(),
+                        "numCandidates": limit,
+                        "limit": limit,
+                        "filter": flt,
+                    }
+                },
+                {"$project": {"_id": 1}},
+            ]
+        )
+    )
+    return len(rows) >= limit
+
+
+def wait_for_vector_index(
+    tenant_id: str,
+    doc_id: str,
+    ingest_version: str,
+    *,
+    timeout_s: float,
+    index_name: str = "vector_index",
+    poll_s: float = 2.0,
+    col=None,
+) -> bool:
+    """
+    Poll until the vector index reflects an ingest (see vector_index_caught_up).
+    Returns False if it has not caught up within `timeout_s`.
+    """
+    col = col if col is not None else get_collection()
+    deadline = time.monotonic() + timeout_s
+    while True:
+        if vector_index_caught_up(col, tenant_id, doc_id, ingest_version, index_name):
+            return True
+        if time.monotonic() + poll_s > deadline:
+            return False
+        time.sleep(poll_s)
@@ -1,11 +1,35 @@
-from pymongo import MongoClient
-import certifi
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from rag_app.core.config import MONGODB_URI, MONGODB_DB, MONGODB_COLLECTION
+from rag_app.core.config import MONGODB_URI, MONGODB_DB, MONGODB_COLLECTION, MONGODB_ANSWERS_COLLECTION, MONGODB_DOCS_COLLECTION
 
-def get_collection():
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+
+@lru_cache(maxsize=1)
+def get_client() -> "MongoClient":
+    """
+    One MongoClient (and connection pool) per process, shared by all callers.
+    pymongo/certifi are imported on first use to keep package import cheap.
+    """
     if not MONGODB_URI:
         raise ValueError("MONGODB_URI is not set")
 
-    client = MongoClient(MONGODB_URI, tlsCAFile=certifi.where())
-    return client[MONGODB_DB][MONGODB_COLLECTION]
+    from pymongo import MongoClient
+    import certifi
+
+    return MongoClient(MONGODB_URI, tlsCAFile=certifi.where())
+
+
+def get_collection():
+    return get_client()[MONGODB_DB][MONGODB_COLLECTION]
+
+
+def get_answers_collection():
+    return get_client()[MONGODB_DB][MONGODB_ANSWERS_COLLECTION]
+
+
+def get_docs_collection():
+    return get_client()[MONGODB_DB][MONGODB_DOCS_COLLECTION]
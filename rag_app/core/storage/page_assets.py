@@ -0,0 +1,130 @@
+# rag_app/core/storage/page_assets.py
+
+import hashlib
+import io
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from rag_app.core.config import IMAGE_OUT_DIR, PAGE_CACHE_MAX_BYTES, PDF_SOURCE_DIR
+from rag_app.core.storage.mongo import get_docs_collection
+from rag_app.core.utils.lru import LRUCache
+
+# Target widths for resized page images; None = original render
+PAGE_SIZES: Dict[str, Optional[int]] = {
+    "thumb": 320,
+    "medium": 1024,
+    "large": 1600,
+    "full": None,
+}
+
+_ID_RE = re.compile(r"^[A-Za-z0-9._-]+$")
+
+
+@dataclass
+class PageAsset:
+    data: bytes
+    media_type: str
+    etag: str
+    last_modified: float   # source file mtime (epoch seconds)
+
+
+@dataclass
+class SourceFile:
+    path: Path
+    etag: str
+    last_modified: float
+
+
+_cache: LRUCache[PageAsset] = LRUCache("page_cache", max_items=4096, max_bytes=PAGE_CACHE_MAX_BYTES, sizeof=lambda a: len(a.data))
+
+
+def _check_id(kind: str, value: str) -> None:
+    # tenant_id / doc_id become path segments and URL parts: no separators, no "." / ".."
+    if not _ID_RE.match(value) or value in (".", ".."):
+        raise ValueError(f"Invalid {kind}: {value!r}")
+
+
+def _etag(*parts: object) -> str:
+    # Derived from file identity (path, mtime, size), so validating a request never reads the file
+    return '"' + hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def page_image_path(doc_id: str, page_num: int) -> Path:
+    # Renders are written per doc_id by the PDF loader
+    _check_id("doc_id", doc_id)
+    return Path(IMAGE_OUT_DIR) / doc_id / f"page_{int(page_num)}.png"
+
+
+def source_pdf_path(tenant_id: str, doc_id: str) -> Path:
+    """
+    Source PDF recorded for the tenant's document at ingest (unique on
+    (tenant_id, doc_id)); PDF_SOURCE_DIR/<doc_id>.pdf for older ingests.
+    """
+    _check_id("tenant_id", tenant_id)
+    _check_id("doc_id", doc_id)
+    row = get_docs_collection().find_one({"tenant_id": tenant_id, "doc_id": doc_id}, {"_id": 0, "pdf_path": 1})
+    if row and row.get("pdf_path"):
+        return Path(row["pdf_path"])
+    return Path(PDF_SOURCE_DIR) / f"{doc_id}.pdf"
+
+
+def page_validators(tenant_id: str, doc_id: str, page_num: int, size: str = "medium") -> Optional[SourceFile]:
+    """
+    ETag / Last-Modified for a page image from a single stat(); None if the page does not exist.
+    """
+    _check_id("tenant_id", tenant_id)
+    if size not in PAGE_SIZES:
+        raise ValueError(f"Unknown size {size!r} (expected one of {list(PAGE_SIZES)})")
+
+    path = page_image_path(doc_id, page_num)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return SourceFile(path=path, etag=_etag(path, size, st.st_mtime_ns, st.st_size), last_modified=st.st_mtime)
+
+
+def get_page_image(tenant_id: str, doc_id: str, page_num: int, size: str = "medium") -> Optional[PageAsset]:
+    """
+    Page image bytes at the requested size. Hot pages are served from the in-memory
+    LRU; an entry is only reused while its ETag matches the file on disk.
+    """
+    src = page_validators(tenant_id, doc_id, page_num, size)
+    if src is None:
+        return None
+
+    key = (doc_id, int(page_num), size)
+    cached = _cache.get(key)
+    if cached is not None and cached.etag == src.etag:
+        return cached
+
+    data = src.path.read_bytes()
+    width = PAGE_SIZES[size]
+    media_type = "image/png"
+
+    if width is not None:
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(data))
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, format="JPEG", quality=85, optimize=True)
+            data = buf.getvalue()
+            media_type = "image/jpeg"
+
+    asset = PageAsset(data=data, media_type=media_type, etag=src.etag, last_modified=src.last_modified)
+    _cache.put(key, asset)
+    return asset
+
+
+def source_pdf(tenant_id: str, doc_id: str) -> Optional[SourceFile]:
+    path = source_pdf_path(tenant_id, doc_id)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return SourceFile(path=path, etag=_etag(path, st.st_mtime_ns, st.st_size), last_modified=st.st_mtime)
@@ -0,0 +1,109 @@
+# rag_app/core/storage/vectors.py
+
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Storage formats for the "embedding" field of chunk documents:
+# - "list":    BSON array of doubles (legacy; ~9 bytes per dimension + per-element keys)
+# - "float32": BSON binary vector subtype 9, float32 (indexable by Atlas Vector Search)
+# - "int8":    BSON binary vector subtype 9, int8 with a per-vector scale (indexable, ~1 byte/dim)
+# - "float16": int8 binary vector in "embedding" for the index, plus a packed little-endian
+#              float16 copy in "embedding_f16" (generic binary, never indexed) that local
+#              rescoring reads for higher precision
+VECTOR_FORMATS = ("list", "float32", "int8", "float16")
+
+BINARY_VECTOR_SUBTYPE = 9
+_DTYPE_FLOAT32 = 0x27
+_DTYPE_INT8 = 0x03
+
+
+def encode_vector(vec: Sequence[float], fmt: str = "list") -> Dict[str, Any]:
+    """
+    Convert an embedding into the chunk-document fields for the given format.
+    Returns "embedding" (always indexable) plus, for packed formats, "embedding_format",
+    "embedding_scale" (int8) and "embedding_f16" (float16).
+    """
+    if fmt == "list":
+        return {"embedding": list(vec)}
+
+    import numpy as np
+    from bson.binary import Binary
+
+    arr = np.asarray(vec, dtype=np.float32)
+
+    if fmt == "float32":
+        header = bytes([_DTYPE_FLOAT32, 0])
+        payload = arr.astype("<f4").tobytes()
+        return {
+            "embedding": Binary(header + payload, BINARY_VECTOR_SUBTYPE),
+            "embedding_format": "float32",
+        }
+
+    if fmt in ("int8", "float16"):
+        # Symmetric per-vector quantization: cosine similarity is scale-invariant,
+        # so the index can compare the int8 values directly.
+        max_abs = float(np.max(np.abs(arr))) if arr.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        q = np.clip(np.rint(arr / scale), -127, 127).astype(np.int8)
+        header = bytes([_DTYPE_INT8, 0])
+        fields = {
+            "embedding": Binary(header + q.tobytes(), BINARY_VECTOR_SUBTYPE),
+            "embedding_format": fmt,
+            "embedding_scale": scale,
+        }
+        if fmt == "float16":
+            # $vectorSearch only indexes "embedding"; the float16 copy is for rescoring
+            fields["embedding_f16"] = Binary(arr.astype("<f2").tobytes())
+        return fields
+
+    raise ValueError(f"Unknown vector format: {fmt!r} (expected one of {VECTOR_FORMATS})")
+
+
+def decode_vector(doc: Dict[str, Any]) -> "np.ndarray":
+    """
+    Read the stored "embedding" back as a NumPy array.
+
+    Packed formats are viewed with np.frombuffer (no copy of the payload);
+    the float16 copy is preferred when present, and int8 vectors are returned
+    as float32 with the stored scale applied.
+    """
+    import numpy as np
+
+    if doc.get("embedding_f16") is not None:
+        return np.frombuffer(doc["embedding_f16"], dtype="<f2")
+
+    raw = doc["embedding"]
+    fmt = doc.get("embedding_format")
+
+    if isinstance(raw, list):
+        return np.asarray(raw, dtype=np.float32)
+
+    # BSON binary vector: 1 byte dtype, 1 byte padding, then the values
+    dtype_byte = raw[0]
+    if dtype_byte == _DTYPE_FLOAT32:
+        return np.frombuffer(raw, dtype="<f4", offset=2)
+    if dtype_byte == _DTYPE_INT8:
+        q = np.frombuffer(raw, dtype=np.int8, offset=2)
+        return q.astype(np.float32) * float(doc.get("embedding_scale", 1.0))
+
+    raise ValueError(f"Unsupported stored vector (dtype byte {dtype_byte:#x}, format {fmt!r})")
+
+
+def cosine_scores(query_vec: Sequence[float], vectors: List["np.ndarray"]) -> "np.ndarray":
+    """
+    Cosine similarity of one query against many stored vectors, in one matrix product.
+    """
+    import numpy as np
+
+    if not vectors:
+        return np.zeros(0, dtype=np.float32)
+
+    q = np.asarray(query_vec, dtype=np.float32)
+    m = np.vstack([v.astype(np.float32, copy=False) for v in vectors])
+
+    q_norm = np.linalg.norm(q) or 1.0
+    m_norm = np.linalg.norm(m, axis=1)
+    m_norm[m_norm == 0] = 1.0
+    return (m @ q) / (m_norm * q_norm)
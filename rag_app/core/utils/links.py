@@ -1,12 +1,30 @@
-from pathlib import Path
+from typing import Optional
 
-def pdf_page_file_url(doc_id: str, page: int) -> str:
+from rag_app.core.config import PAGE_ASSET_BASE_URL
+
+# Public URL provided by the user (used when no page-asset service is configured)
+LEGACY_BROCHURE_URL = "https://www.myhomeconstructions.com/wp-content/themes/sdna/broucher/My-Home-Tridasa-E-Brochure.pdf"
+
+
+def pdf_page_file_url(tenant_id: str, doc_id: str, page: int) -> str:
     """
-    Build a PDF link from doc_id and page number.
-    Updated to use the public URL for the My Home Tridasa brochure.
+    Build a PDF link from tenant, doc_id and page number.
+    Points at the page-asset service (rag_app/apps/api) when PAGE_ASSET_BASE_URL is set,
+    otherwise at the public URL for the My Home Tridasa brochure.
     """
-    # Public URL provided by the user
-    base_url = "https://www.myhomeconstructions.com/wp-content/themes/sdna/broucher/My-Home-Tridasa-E-Brochure.pdf"
-    
+    if PAGE_ASSET_BASE_URL:
+        base_url = f"{PAGE_ASSET_BASE_URL.rstrip('/')}/tenants/{tenant_id}/docs/{doc_id}/source.pdf"
+    else:
+        base_url = LEGACY_BROCHURE_URL
+
     # Appending the page fragment for direct navigation
     return f"{base_url}#page={page}"
+
+
+def page_image_url(tenant_id: str, doc_id: str, page: int, size: str = "medium") -> Optional[str]:
+    """
+    URL of a rendered page image on the page-asset service, or None if it is not configured.
+    """
+    if not PAGE_ASSET_BASE_URL:
+        return None
+    return f"{PAGE_ASSET_BASE_URL.rstrip('/')}/tenants/{tenant_id}/docs/{doc_id}/pages/{page}?size={size}"
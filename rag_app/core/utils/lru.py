@@ -0,0 +1,78 @@
+# rag_app/core/utils/lru.py
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from rag_app.core.utils.metrics import incr
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe in-process LRU cache.
+
+    Bounded by item count and, optionally, by total size as reported by `sizeof`.
+    Hits and misses are counted as "<name>_hits" / "<name>_misses" metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_items: int = 1024,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda v: 0)
+        self.total_bytes = 0
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            if key not in self._data:
+                incr(f"{self.name}_misses")
+                return None
+            self._data.move_to_end(key)
+            incr(f"{self.name}_hits")
+            return self._data[key]
+
+    def put(self, key: Hashable, value: V) -> None:
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # never cache something bigger than the whole cache
+
+        with self._lock:
+            if key in self._data:
+                self.total_bytes -= self.sizeof(self._data.pop(key))
+            self._data[key] = value
+            self.total_bytes += size
+
+            while len(self._data) > self.max_items or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, evicted = self._data.popitem(last=False)
+                self.total_bytes -= self.sizeof(evicted)
+                incr(f"{self.name}_evictions")
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            value = self._data.pop(key, None)
+            if value is not None:
+                self.total_bytes -= self.sizeof(value)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
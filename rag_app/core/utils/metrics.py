@@ -0,0 +1,180 @@
+# rag_app/core/utils/metrics.py
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Histogram buckets (seconds) for stage durations.
+# Covers fast cache hits up to slow OCR / LLM calls.
+STAGE_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_stage_counts: Dict[str, List[int]] = {}   # stage -> per-bucket counts (+Inf last)
+_stage_sums: Dict[str, float] = {}
+_stage_errors: Dict[str, int] = {}         # stage -> exceptions that escaped it
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("rag_current_trace", default=None)
+
+
+class Trace:
+    """
+    Collects stage timings for one request (one ingest_pdf or answer_question call).
+    Nested stages are recorded under their own name; repeated stages are summed.
+    """
+
+    def __init__(self) -> None:
+        self.spans: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Stage timings in milliseconds, plus the total wall time of the trace.
+        """
+        out = {name: round(s * 1000.0, 3) for name, s in self.spans.items()}
+        out["total"] = round((time.perf_counter() - self.started) * 1000.0, 3)
+        return out
+
+
+@contextmanager
+def start_trace() -> Iterator[Trace]:
+    """
+    Open a trace for the current call. Spans recorded anywhere below
+    (retriever, embeddings, ...) are attached to it.
+    """
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def observe(stage: str, seconds: float) -> None:
+    with _lock:
+        counts = _stage_counts.get(stage)
+        if counts is None:
+            counts = [0] * (len(STAGE_BUCKETS) + 1)
+            _stage_counts[stage] = counts
+            _stage_sums[stage] = 0.0
+
+        for i, bound in enumerate(STAGE_BUCKETS):
+            if seconds <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+
+        _stage_sums[stage] += seconds
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Time a block. The duration goes into the process-wide histogram and,
+    if a trace is active, into that trace.
+
+    An exception escaping the block is counted as an error of the innermost
+    stage it came from, and tagged with that stage (`exc.rag_stage`).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        if getattr(e, "rag_stage", None) is None:
+            try:
+                e.rag_stage = stage
+            except AttributeError:
+                pass
+            with _lock:
+                _stage_errors[stage] = _stage_errors.get(stage, 0) + 1
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(stage, elapsed)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, elapsed)
+
+
+def incr(name: str, value: float = 1) -> None:
+    """
+    Increment a process-wide counter (cache hits, retries, bytes processed, ...).
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def get_counter(name: str) -> float:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def get_stage_errors(stage: str) -> int:
+    with _lock:
+        return _stage_errors.get(stage, 0)
+
+
+def reset_metrics() -> None:
+    with _lock:
+        _counters.clear()
+        _stage_counts.clear()
+        _stage_sums.clear()
+        _stage_errors.clear()
+
+
+def _sanitize(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in name)
+
+
+def export_prometheus(prefix: str = "rag") -> str:
+    """
+    Render all counters and stage histograms in the Prometheus text exposition format.
+    """
+    with _lock:
+        counters = dict(_counters)
+        stage_counts = {k: list(v) for k, v in _stage_counts.items()}
+        stage_sums = dict(_stage_sums)
+        stage_errors = dict(_stage_errors)
+
+    lines: List[str] = []
+
+    for name in sorted(counters):
+        metric = f"{prefix}_{_sanitize(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {counters[name]}")
+
+    if stage_counts:
+        metric = f"{prefix}_stage_seconds"
+        lines.append(f"# HELP {metric} Duration of pipeline stages in seconds.")
+        lines.append(f"# TYPE {metric} histogram")
+
+        for stage in sorted(stage_counts):
+            counts = stage_counts[stage]
+            label = _sanitize(stage)
+            cumulative = 0
+            for bound, c in zip(STAGE_BUCKETS, counts):
+                cumulative += c
+                lines.append(f'{metric}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{metric}_bucket{{stage="{label}",le="+Inf"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{label}"}} {stage_sums[stage]}')
+            lines.append(f'{metric}_count{{stage="{label}"}} {cumulative}')
+
+    if stage_errors:
+        metric = f"{prefix}_stage_errors_total"
+        lines.append(f"# HELP {metric} Exceptions raised out of pipeline stages.")
+        lines.append(f"# TYPE {metric} counter")
+        for stage in sorted(stage_errors):
+            lines.append(f'{metric}{{stage="{_sanitize(stage)}"}} {stage_errors[stage]}')
+
+    return "\n".join(lines) + "\n"
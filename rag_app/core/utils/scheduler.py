@@ -0,0 +1,255 @@
+# rag_app/core/utils/scheduler.py
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, TypeVar
+
+from rag_app.core.config import (
+    BACKGROUND_SHARE,
+    GROQ_BURST,
+    GROQ_MAX_CONCURRENCY,
+    GROQ_RATE_PER_SEC,
+    HF_BURST,
+    HF_MAX_CONCURRENCY,
+    HF_RATE_PER_SEC,
+)
+from rag_app.core.utils.metrics import incr, span
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes
+INTERACTIVE = "interactive"   # user-facing queries
+BACKGROUND = "background"     # ingest, precompute
+
+_current_lane: ContextVar[str] = ContextVar("rag_scheduler_lane", default=INTERACTIVE)
+
+
+@contextmanager
+def lane(priority: str) -> Iterator[None]:
+    """
+    Run a block in the given priority lane; calls made without an explicit
+    priority (e.g. answer_question during precompute) inherit it.
+    """
+    token = _current_lane.set(priority)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second, at most `burst` stored.
+
+    Lane-aware: the last `reserve` tokens can only be taken by interactive
+    callers, and background callers take nothing while an interactive caller
+    is waiting, so background work cannot drain the rate budget.
+    """
+
+    def __init__(self, rate: float, burst: float, reserve: float = 0.0) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.reserve = max(0.0, min(reserve, burst - 1))
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._interactive_waiting = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, priority: str = INTERACTIVE) -> float:
+        """
+        Take a token if the lane may; returns 0 on success, else seconds to wait before retrying.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if priority == BACKGROUND:
+                if self._interactive_waiting:
+                    return 1.0 / self.rate
+                needed = 1 + self.reserve
+            else:
+                needed = 1
+
+            if self._tokens >= needed:
+                self._tokens -= 1
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+    def acquire(self, priority: str = INTERACTIVE) -> None:
+        wait_s = self.try_acquire(priority)
+        if not wait_s:
+            return
+
+        if priority == INTERACTIVE:
+            with self._lock:
+                self._interactive_waiting += 1
+        try:
+            while wait_s:
+                time.sleep(wait_s)
+                wait_s = self.try_acquire(priority)
+        finally:
+            if priority == INTERACTIVE:
+                with self._lock:
+                    self._interactive_waiting -= 1
+
+
+class PriorityLimiter:
+    """
+    Caps in-flight calls. Background calls may use at most `max_background`
+    slots and never start while an interactive caller is waiting.
+    """
+
+    def __init__(self, max_concurrency: int, background_share: float = 0.5) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_background = max(1, int(max_concurrency * background_share))
+        self._in_flight = 0
+        self._background_in_flight = 0
+        self._waiting: Dict[str, int] = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._cond = threading.Condition()
+
+    def _can_start(self, priority: str) -> bool:
+        if self._in_flight >= self.max_concurrency:
+            return False
+        if priority == BACKGROUND:
+            return self._waiting[INTERACTIVE] == 0 and self._background_in_flight < self.max_background
+        return True
+
+    def acquire(self, priority: str) -> None:
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while not self._can_start(priority):
+                    self._cond.wait()
+            finally:
+                self._waiting[priority] -= 1
+
+            self._in_flight += 1
+            if priority == BACKGROUND:
+                self._background_in_flight += 1
+
+    def release(self, priority: str) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if priority == BACKGROUND:
+                self._background_in_flight -= 1
+            self._cond.notify_all()
+
+
+class Provider:
+    """
+    Client-side scheduler for one external service.
+
+    - single-flight: concurrent calls with the same key share one execution
+    - lane-aware token bucket + priority-aware concurrency limit per provider; the
+      interactive lane keeps a reserve of `burst * (1 - background_share)` tokens
+    - retries with capped, jittered exponential backoff (no slot held while sleeping)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rate_per_sec: float,
+        burst: float,
+        max_concurrency: int,
+        background_share: float = 0.5,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+    ) -> None:
+        self.name = name
+        self.bucket = TokenBucket(rate_per_sec, burst, reserve=max(1.0, burst * (1 - background_share)))
+        self.limiter = PriorityLimiter(max_concurrency, background_share)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        key: Optional[Hashable] = None,
+        priority: Optional[str] = None,
+        retries: int = 5,
+    ) -> T:
+        priority = priority or _current_lane.get()
+
+        if key is None:
+            return self._execute(fn, priority, retries)
+
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            incr(f"{self.name}_coalesced")
+            return fut.result()
+
+        try:
+            result = self._execute(fn, priority, retries)
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _execute(self, fn: Callable[[], T], priority: str, retries: int) -> T:
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(retries):
+            with span(f"{self.name}.wait"):
+                self.bucket.acquire(priority)
+                self.limiter.acquire(priority)
+            try:
+                incr(f"{self.name}_calls")
+                return fn()
+            except Exception as e:
+                last_error = e
+                incr(f"{self.name}_retries")
+                logger.warning("%s call failed (attempt %d/%d): %s", self.name, attempt + 1, retries, e)
+            finally:
+                self.limiter.release(priority)
+
+            if attempt + 1 < retries:
+                # full jitter so synchronized failures do not retry in lockstep
+                cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+                time.sleep(random.uniform(0, cap))
+
+        incr(f"{self.name}_failures")
+        raise RuntimeError(f"{self.name} call failed after {retries} attempts") from last_error
+
+
+_providers: Dict[str, Provider] = {}
+_providers_lock = threading.Lock()
+
+_PROVIDER_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "huggingface": {"rate_per_sec": HF_RATE_PER_SEC, "burst": HF_BURST, "max_concurrency": HF_MAX_CONCURRENCY},
+    "groq": {"rate_per_sec": GROQ_RATE_PER_SEC, "burst": GROQ_BURST, "max_concurrency": GROQ_MAX_CONCURRENCY},
+}
+
+
+def get_provider(name: str) -> Provider:
+    """
+    Process-wide scheduler for a provider ("huggingface", "groq", ...).
+    """
+    with _providers_lock:
+        provider = _providers.get(name)
+        if provider is None:
+            settings = _PROVIDER_DEFAULTS.get(name, {"rate_per_sec": 10.0, "burst": 10.0, "max_concurrency": 4})
+            provider = Provider(name, background_share=BACKGROUND_SHARE, **settings)
+            _providers[name] = provider
+        return provider
@@ -0,0 +1,81 @@
+# rag_app/core/warmup.py
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rag_app.core.config import RERANK_ENABLED
+from rag_app.core.utils.metrics import incr, span
+
+logger = logging.getLogger(__name__)
+
+
+def _steps(tenant_id: Optional[str], doc_id: Optional[str]) -> List[Tuple[str, Callable[[], Any]]]:
+    # Imports are deferred to the steps themselves so importing this module stays cheap
+    def mongo() -> Any:
+        from rag_app.core.storage.mongo import get_client
+        return get_client().admin.command("ping")
+
+    def embedder() -> Any:
+        from rag_app.core.ingest.embeddings import get_embedder
+        return get_embedder()
+
+    def groq() -> Any:
+        from rag_app.core.rag.chain import get_groq_client
+        return get_groq_client()
+
+    def reranker() -> Any:
+        from rag_app.core.rag.reranker import get_reranker
+        return get_reranker()
+
+    def chunk_cache() -> Any:
+        from rag_app.core.rag.chunk_cache import prime_chunk_cache
+        return prime_chunk_cache(tenant_id, doc_id)
+
+    steps = [("mongo", mongo), ("embedder", embedder), ("groq", groq)]
+    if RERANK_ENABLED:
+        steps.append(("reranker", reranker))
+    if tenant_id and doc_id:
+        steps.append(("chunk_cache", chunk_cache))
+    return steps
+
+
+def _run(tenant_id: Optional[str], doc_id: Optional[str], report: Dict[str, Any]) -> None:
+    for name, step in _steps(tenant_id, doc_id):
+        start = time.perf_counter()
+        try:
+            with span(f"warmup.{name}"):
+                step()
+            report[name] = round((time.perf_counter() - start) * 1000.0, 3)
+        except Exception as e:
+            # A failed step (missing key, no network) must not take the worker down
+            report[name] = f"error: {e}"
+            incr("warmup_errors")
+            logger.warning("Warm-up step %s failed: %s", name, e)
+
+
+def warm_up(
+    *,
+    tenant_id: Optional[str] = None,
+    doc_id: Optional[str] = None,
+    background: bool = True,
+) -> Dict[str, Any]:
+    """
+    Pre-connect MongoDB, construct the HF/Groq clients, load the reranker (if enabled)
+    and, given a tenant/doc, prime the chunk cache.
+
+    With background=True this returns immediately; the returned report dict is
+    filled in (step -> ms or "error: ...") as steps complete, and "done" is set at the end.
+    """
+    report: Dict[str, Any] = {"done": False}
+
+    def target() -> None:
+        _run(tenant_id, doc_id, report)
+        report["done"] = True
+
+    if background:
+        threading.Thread(target=target, name="rag-warmup", daemon=True).start()
+    else:
+        target()
+    return report
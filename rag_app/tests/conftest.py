@@ -0,0 +1,174 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from rag_app.core.rag import chain, chunk_cache, retriever
+
+
+def _matches(row: Dict[str, Any], flt: Dict[str, Any]) -> bool:
+    for key, cond in flt.items():
+        if key == "$or":
+            if not any(_matches(row, sub) for sub in cond):
+                return False
+            continue
+
+        value = row.get(key)
+        if isinstance(cond, dict):
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+            if "$ne" in cond and value == cond["$ne"]:
+                return False
+        elif isinstance(value, list):
+            if cond not in value:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _project(row: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    projection = projection or {}
+    if any(v == 1 for v in projection.values()):
+        out = {k: row[k] for k, v in projection.items() if v == 1 and k != "_id" and k in row}
+    else:
+        out = {k: v for k, v in row.items() if k != "_id" and projection.get(k, 1) != 0}
+    if projection.get("_id", 1) and "_id" in row:
+        out["_id"] = row["_id"]
+    return out
+
+
+class FakeCursor(list):
+    def sort(self, key, direction=1):
+        return FakeCursor(sorted(self, key=lambda r: r[key], reverse=direction < 0))
+
+    def limit(self, n):
+        return FakeCursor(self[:n]) if n else self
+
+
+class FakeCollection:
+    """
+    In-memory stand-in for the part of a pymongo Collection the app uses.
+
+    `calls` records operation names in order and `filters` the filter of each
+    find. `$vectorSearch` returns matching rows in stored order with a fixed
+    score; ids in `unindexed` are not visible to it yet.
+    """
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None, score: float = 0.5) -> None:
+        self.rows = list(rows or [])
+        self.score = score
+        self.unindexed = set()
+        self.calls: List[str] = []
+        self.filters: List[Dict[str, Any]] = []
+
+    def find(self, flt, projection=None):
+        self.calls.append("find")
+        self.filters.append(flt)
+        return FakeCursor(_project(r, projection) for r in self.rows if _matches(r, flt))
+
+    def find_one(self, flt, projection=None):
+        self.calls.append("find_one")
+        return next((_project(r, projection) for r in self.rows if _matches(r, flt)), None)
+
+    def count_documents(self, flt, limit=0):
+        self.calls.append("count")
+        n = sum(1 for r in self.rows if _matches(r, flt))
+        return min(n, limit) if limit else n
+
+    def aggregate(self, pipeline):
+        self.calls.append("aggregate")
+        self.pipeline = pipeline
+        vs = pipeline[0]["$vectorSearch"]
+        projection = pipeline[1]["$project"] if len(pipeline) > 1 else None
+        hits = [r for r in self.rows if r.get("_id") not in self.unindexed and _matches(r, vs.get("filter", {}))]
+
+        out = []
+        for r in hits[: vs["limit"]]:
+            doc = _project(r, projection)
+            if projection and "score" in projection:
+                doc["score"] = self.score
+            out.append(doc)
+        return out
+
+    def replace_one(self, flt, doc, upsert=False):
+        self.calls.append("replace_one")
+        self._replace(flt, doc, upsert)
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append("bulk_write")
+        for op in ops:   # pymongo.ReplaceOne
+            self._replace(op._filter, op._doc, op._upsert)
+
+    def delete_many(self, flt):
+        self.calls.append("delete_many")
+        kept = [r for r in self.rows if not _matches(r, flt)]
+        deleted = len(self.rows) - len(kept)
+        self.rows = kept
+        return SimpleNamespace(deleted_count=deleted)
+
+    def _replace(self, flt, doc, upsert):
+        for i, r in enumerate(self.rows):
+            if _matches(r, flt):
+                self.rows[i] = dict(doc, _id=r.get("_id"))
+                return
+        if upsert:
+            self.rows.append(dict(doc, _id=len(self.rows) + 1))
+
+
+def _chunk_row(page, idx, text=None, *, version="v1", source_pages=None, tenant_id="t1", doc_id="doc"):
+    return {
+        "_id": f"{page}:{idx}:{version}",
+        "tenant_id": tenant_id,
+        "doc_id": doc_id,
+        "page_num": page,
+        "chunk_index": idx,
+        "ingest_version": version,
+        "text": f"{version} text {page}.{idx}" if text is None else text,
+        "image_path": f"storage/images/{doc_id}/page_{page}.png",
+        "source_pages": source_pages or [page],
+    }
+
+
+@pytest.fixture
+def make_collection():
+    return FakeCollection
+
+
+@pytest.fixture
+def chunk_row():
+    return _chunk_row
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    """
+    Empty chunk collection behind the retriever and the chunk cache, with the
+    query embedder stubbed out (queries it was asked to embed are in `.embeds`).
+    """
+    col = FakeCollection()
+    col.embeds = []
+    monkeypatch.setattr(retriever, "get_collection", lambda: col)
+    monkeypatch.setattr(chunk_cache, "get_collection", lambda: col)
+    monkeypatch.setattr(retriever, "embed_query", lambda q: col.embeds.append(q) or [0.0, 1.0])
+    chunk_cache.clear_chunk_cache()
+    yield col
+    chunk_cache.clear_chunk_cache()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Groq client answering every prompt with a fixed completion; returns the prompts sent.
+    """
+    prompts: List[str] = []
+
+    def create(*, model, messages, temperature=0.0):
+        prompts.append(messages[-1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="Stub answer (Page 1)."))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(chain, "get_groq_client", lambda: client)
+    monkeypatch.setattr(chain, "GROQ_API_KEY", "test")
+    monkeypatch.setattr(chain, "GROQ_MODEL", "test-model")
+    return prompts
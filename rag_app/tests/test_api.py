@@ -0,0 +1,111 @@
+import io
+import time
+from email.utils import formatdate
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("PIL")
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from rag_app.apps.api.app import app
+from rag_app.core.storage import page_assets
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 4000 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, make_collection):
+    images = tmp_path / "images" / "brochure"
+    images.mkdir(parents=True)
+    Image.new("RGB", (2000, 1000), "white").save(images / "page_1.png")
+
+    # Ingested from a manifest: the PDF lives outside PDF_SOURCE_DIR and has a different name
+    pdf = tmp_path / "uploads" / "Tridasa Final v3.pdf"
+    pdf.parent.mkdir()
+    pdf.write_bytes(PDF_BYTES)
+    other = tmp_path / "uploads" / "Other tenant.pdf"
+    other.write_bytes(b"%PDF-1.4\nanother tenant's brochure\n%%EOF\n")
+    docs = make_collection([
+        {"tenant_id": "t1", "doc_id": "brochure", "pdf_path": str(pdf)},
+        {"tenant_id": "t2", "doc_id": "brochure", "pdf_path": str(other)},
+    ])
+
+    monkeypatch.setattr(page_assets, "IMAGE_OUT_DIR", str(tmp_path / "images"))
+    monkeypatch.setattr(page_assets, "PDF_SOURCE_DIR", str(tmp_path / "raw"))
+    monkeypatch.setattr(page_assets, "get_docs_collection", lambda: docs)
+    page_assets._cache.clear()
+    yield TestClient(app)
+    page_assets._cache.clear()
+
+
+def test_page_sizes(client):
+    thumb = client.get("/tenants/t1/docs/brochure/pages/1?size=thumb")
+    assert thumb.status_code == 200
+    assert thumb.headers["content-type"] == "image/jpeg"
+    assert Image.open(io.BytesIO(thumb.content)).size == (320, 160)
+    assert "max-age" in thumb.headers["cache-control"]
+
+    full = client.get("/tenants/t1/docs/brochure/pages/1?size=full")
+    assert full.headers["content-type"] == "image/png"
+    assert Image.open(io.BytesIO(full.content)).size == (2000, 1000)
+    assert full.headers["etag"] != thumb.headers["etag"]
+
+    assert client.get("/tenants/t1/docs/brochure/pages/1?size=huge").status_code == 400
+    assert client.get("/tenants/t1/docs/brochure/pages/2").status_code == 404
+
+
+def test_page_revalidation(client):
+    first = client.get("/tenants/t1/docs/brochure/pages/1")
+    etag = first.headers["etag"]
+
+    assert client.get("/tenants/t1/docs/brochure/pages/1", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/tenants/t1/docs/brochure/pages/1", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    later = formatdate(time.time() + 60, usegmt=True)
+    earlier = formatdate(time.time() - 86400, usegmt=True)
+    assert client.get("/tenants/t1/docs/brochure/pages/1", headers={"If-Modified-Since": later}).status_code == 304
+    assert client.get("/tenants/t1/docs/brochure/pages/1", headers={"If-Modified-Since": earlier}).status_code == 200
+
+
+def test_source_pdf_uses_recorded_path(client):
+    res = client.get("/tenants/t1/docs/brochure/source.pdf")
+    assert res.status_code == 200
+    assert res.content == PDF_BYTES
+    assert res.headers["content-type"] == "application/pdf"
+
+    assert client.get("/tenants/t1/docs/brochure/source.pdf", headers={"If-None-Match": res.headers["etag"]}).status_code == 304
+    assert client.get("/tenants/t1/docs/unknown/source.pdf").status_code == 404
+
+
+def test_source_pdf_is_scoped_to_the_tenant(client):
+    # Both tenants have a "brochure"; each gets its own file
+    assert client.get("/tenants/t1/docs/brochure/source.pdf").content == PDF_BYTES
+    assert b"another tenant" in client.get("/tenants/t2/docs/brochure/source.pdf").content
+    assert client.get("/tenants/t3/docs/brochure/source.pdf").status_code == 404
+
+
+def test_source_pdf_range(client):
+    res = client.get("/tenants/t1/docs/brochure/source.pdf", headers={"Range": "bytes=0-7"})
+    assert res.status_code == 206
+    assert res.content == PDF_BYTES[:8]
+    assert res.headers["content-range"] == f"bytes 0-7/{len(PDF_BYTES)}"
+
+
+@pytest.mark.parametrize("bad_id", ["bad%20id", "semi;colon", "%2E%2E"])
+def test_id_validation(client, bad_id):
+    assert client.get(f"/tenants/t1/docs/{bad_id}/pages/1").status_code == 400
+    assert client.get(f"/tenants/t1/docs/{bad_id}/source.pdf").status_code == 400
+    assert client.get(f"/tenants/{bad_id}/docs/brochure/pages/1").status_code == 400
+    assert client.get(f"/tenants/{bad_id}/docs/brochure/source.pdf").status_code == 400
+
+
+def test_id_validation_rejects_before_touching_disk():
+    with pytest.raises(ValueError):
+        page_assets.page_image_path("../etc", 1)
+    with pytest.raises(ValueError):
+        page_assets.source_pdf_path("t1", "a b")
+    with pytest.raises(ValueError):
+        page_assets.source_pdf_path("..", "brochure")
@@ -0,0 +1,252 @@
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from rag_app.core.ingest import batch, pipeline
+from rag_app.core.ingest.batch import IngestJob, load_jobs, run_batch
+from rag_app.core.ingest.checkpoint import IngestCheckpoint
+from rag_app.core.ingest.chunker import TextChunk
+from rag_app.core.ingest.extractor import ExtractedPage
+from rag_app.core.ingest.pdf_loader import PdfPage
+
+
+def test_load_jobs_from_json_list_and_jsonl(tmp_path):
+    listed = tmp_path / "jobs.json"
+    listed.write_text(json.dumps([
+        {"pdf_path": "a/Brochure-A.pdf", "tenant_id": "t1", "doc_id": "doc-a"},
+        {"pdf_path": "b/Brochure-B.pdf"},
+    ]))
+    jobs = load_jobs(str(listed), tenant_id="fallback")
+    assert jobs == [
+        IngestJob(pdf_path="a/Brochure-A.pdf", tenant_id="t1", doc_id="doc-a"),
+        IngestJob(pdf_path="b/Brochure-B.pdf", tenant_id="fallback", doc_id="Brochure-B"),
+    ]
+
+    lines = tmp_path / "jobs.jsonl"
+    lines.write_text('{"pdf_path": "c.pdf", "tenant_id": "t2", "ocr_lang": "tel"}\n\n{"pdf_path": "d.pdf", "tenant_id": "t2"}\n')
+    jobs = load_jobs(str(lines), ocr_lang="eng")
+    assert [(j.doc_id, j.ocr_lang) for j in jobs] == [("c", "tel"), ("d", "eng")]
+
+
+def test_load_jobs_errors(tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text('{"pdf_path": "x.pdf"}\n')
+    with pytest.raises(ValueError):
+        load_jobs(str(manifest))
+    with pytest.raises(ValueError):
+        load_jobs(str(tmp_path))
+
+
+def test_load_jobs_from_directory(tmp_path):
+    (tmp_path / "b.pdf").write_bytes(b"")
+    (tmp_path / "a.pdf").write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("")
+    jobs = load_jobs(str(tmp_path), tenant_id="t1")
+    assert [j.doc_id for j in jobs] == ["a", "b"]
+
+
+def test_run_batch_respects_per_tenant_limit(monkeypatch, tmp_path):
+    lock = threading.Lock()
+    running = {}
+    peak = {}
+
+    def fake_ingest(pdf_path, tenant_id, doc_id, ocr_lang, checkpoint, **kwargs):
+        with lock:
+            running[tenant_id] = running.get(tenant_id, 0) + 1
+            peak[tenant_id] = max(peak.get(tenant_id, 0), running[tenant_id])
+        time.sleep(0.02)
+        with lock:
+            running[tenant_id] -= 1
+        checkpoint.mark_done()
+        return {"pages": 2, "chunks_inserted": 3}
+
+    monkeypatch.setattr(batch, "ingest_pdf", fake_ingest)
+    jobs = [IngestJob(f"{t}-{i}.pdf", t, f"{t}-{i}") for t in ("big", "small") for i in range(6)]
+
+    result = run_batch(jobs, workers=4, per_tenant=1, checkpoint_dir=str(tmp_path))
+
+    assert result["completed"] == 12 and result["failed"] == 0
+    assert result["pages"] == 24 and result["chunks_inserted"] == 36
+    assert peak == {"big": 1, "small": 1}
+
+
+def test_run_batch_skips_finished_and_force_restarts(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_ingest(pdf_path, tenant_id, doc_id, ocr_lang, checkpoint, **kwargs):
+        calls.append((doc_id, dict(checkpoint.pages)))
+        checkpoint.mark_page(1, "ocr text")
+        if doc_id == "broken":
+            raise RuntimeError("OCR crashed")
+        checkpoint.mark_done()
+        return {"pages": 1}
+
+    monkeypatch.setattr(batch, "ingest_pdf", fake_ingest)
+    jobs = [IngestJob("ok.pdf", "t1", "ok"), IngestJob("broken.pdf", "t1", "broken")]
+
+    first = run_batch(jobs, workers=2, per_tenant=2, checkpoint_dir=str(tmp_path))
+    assert (first["completed"], first["failed"]) == (1, 1)
+
+    calls.clear()
+    second = run_batch(jobs, workers=2, per_tenant=2, checkpoint_dir=str(tmp_path))
+    assert (second["skipped"], second["failed"]) == (1, 1)
+    # The interrupted document resumes with the pages OCR'd before the crash
+    assert calls == [("broken", {1: "ocr text"})]
+
+    calls.clear()
+    run_batch(jobs[:1], workers=1, per_tenant=1, checkpoint_dir=str(tmp_path), force=True)
+    assert calls == [("ok", {})]
+
+
+def test_run_batch_restarts_when_the_pdf_changed(monkeypatch, tmp_path):
+    pdf = tmp_path / "brochure.pdf"
+    pdf.write_bytes(b"%PDF v1")
+    calls = []
+
+    def fake_ingest(pdf_path, tenant_id, doc_id, ocr_lang, checkpoint, **kwargs):
+        calls.append(dict(checkpoint.pages))
+        checkpoint.mark_page(1, "ocr of v1")
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(batch, "ingest_pdf", fake_ingest)
+    jobs = [IngestJob(str(pdf), "t1", "doc")]
+    checkpoint_dir = str(tmp_path / "checkpoints")
+
+    run_batch(jobs, workers=1, per_tenant=1, checkpoint_dir=checkpoint_dir)
+    run_batch(jobs, workers=1, per_tenant=1, checkpoint_dir=checkpoint_dir)
+    assert calls == [{}, {1: "ocr of v1"}]
+
+    # Same path, new brochure: the OCR'd pages of the old file must not be reused
+    pdf.write_bytes(b"%PDF v2 with more pages")
+    run_batch(jobs, workers=1, per_tenant=1, checkpoint_dir=checkpoint_dir)
+    assert calls[-1] == {}
+
+    # Manifest now points the document at another file
+    other = tmp_path / "other.pdf"
+    other.write_bytes(b"%PDF v2 with more pages")
+    run_batch([IngestJob(str(other), "t1", "doc")], workers=1, per_tenant=1, checkpoint_dir=checkpoint_dir)
+    assert calls[-1] == {}
+
+
+def test_run_batch_validates_limits():
+    with pytest.raises(ValueError):
+        run_batch([], per_tenant=0)
+    with pytest.raises(ValueError):
+        run_batch([], workers=0)
+
+
+class CrashAfter:
+    """
+    Checkpoint.mark_chunks replacement that crashes on its n-th call, after the batch was stored.
+    """
+
+    def __init__(self, checkpoint, n):
+        self.original = checkpoint.mark_chunks
+        self.calls = 0
+        self.n = n
+
+    def __call__(self, keys):
+        self.calls += 1
+        if self.calls == self.n:
+            raise KeyboardInterrupt
+        self.original(keys)
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch, make_collection):
+    store = SimpleNamespace(chunks=make_collection(), docs=make_collection())
+    pages = [PdfPage(page_num=p, native_text="", image_bytes=b"", image_path=f"p{p}.png") for p in (1, 2)]
+
+    monkeypatch.setattr(pipeline, "load_pdf_pages", lambda pdf_path, doc_id: pages)
+    monkeypatch.setattr(
+        pipeline,
+        "extract_pages_with_ocr",
+        lambda pages, ocr_lang, checkpoint: [ExtractedPage(p.page_num, f"text {p.page_num}", p.image_path) for p in pages],
+    )
+    monkeypatch.setattr(
+        pipeline,
+        "chunk_pages",
+        lambda extracted, chunk_size, overlap: [
+            TextChunk(page_num=p.page_num, chunk_index=i, text=f"{p.text} / {i}", image_path=p.image_path)
+            for p in extracted
+            for i in range(2)
+        ],
+    )
+    monkeypatch.setattr(pipeline, "embed_texts", lambda texts: [[0.1, 0.2]] * len(texts))
+    monkeypatch.setattr(pipeline, "get_collection", lambda: store.chunks)
+    monkeypatch.setattr(pipeline, "get_docs_collection", lambda: store.docs)
+    return store
+
+
+def _ingest(**kwargs):
+    return pipeline.ingest_pdf("doc.pdf", "t1", "doc", store_batch_size=2, materialize=False, dedupe=False, **kwargs)
+
+
+def _stored(store):
+    return {(r["tenant_id"], r["doc_id"], r["page_num"], r["chunk_index"]): r for r in store.chunks.rows}
+
+
+def _old_chunk(doc_id, page, text, version="old"):
+    return {"tenant_id": "t1", "doc_id": doc_id, "page_num": page, "chunk_index": 0, "text": text, "ingest_version": version}
+
+
+def test_fresh_ingest_replaces_previous_chunks(fake_pipeline):
+    fake_pipeline.chunks.rows += [
+        _old_chunk("doc", 9, "stale page from an older version"),
+        _old_chunk("other", 1, "another document"),
+    ]
+
+    res = _ingest()
+    stored = _stored(fake_pipeline)
+    assert res["chunks_inserted"] == 4
+    assert fake_pipeline.chunks.calls.count("delete_many") == 1
+    assert ("t1", "doc", 9, 0) not in stored
+    assert ("t1", "other", 1, 0) in stored
+
+    first_version = stored[("t1", "doc", 1, 0)]["ingest_version"]
+    _ingest()
+    stored = _stored(fake_pipeline)
+    assert len([k for k in stored if k[1] == "doc"]) == 4
+    assert stored[("t1", "doc", 1, 0)]["ingest_version"] != first_version
+
+    (record,) = fake_pipeline.docs.rows
+    assert (record["tenant_id"], record["doc_id"]) == ("t1", "doc")
+    assert Path(record["pdf_path"]).is_absolute() and record["pdf_path"].endswith("doc.pdf")
+    assert record["ingest_version"] == stored[("t1", "doc", 1, 0)]["ingest_version"]
+
+
+def test_previous_version_stays_until_new_chunks_are_stored(fake_pipeline, monkeypatch):
+    fake_pipeline.chunks.rows.append(_old_chunk("doc", 9, "page dropped from the new brochure"))
+    seen_during_embed = []
+
+    def embed(texts):
+        seen_during_embed.append(("t1", "doc", 9, 0) in _stored(fake_pipeline))
+        return [[0.1, 0.2]] * len(texts)
+
+    monkeypatch.setattr(pipeline, "embed_texts", embed)
+    _ingest()
+
+    assert seen_during_embed == [True, True]
+    assert ("t1", "doc", 9, 0) not in _stored(fake_pipeline)
+    assert len(fake_pipeline.chunks.rows) == 4
+
+
+def test_resume_after_crash_does_not_duplicate(fake_pipeline, tmp_path):
+    checkpoint = IngestCheckpoint.for_doc("t1", "doc", base_dir=str(tmp_path))
+    checkpoint.mark_chunks = CrashAfter(checkpoint, n=2)
+    with pytest.raises(KeyboardInterrupt):
+        _ingest(checkpoint=checkpoint)
+    assert len(fake_pipeline.chunks.rows) == 4   # second batch stored, but not checkpointed
+
+    resumed = IngestCheckpoint.for_doc("t1", "doc", base_dir=str(tmp_path))
+    res = _ingest(checkpoint=resumed)
+    assert res["chunks_resumed"] == 2
+    # stale chunks are pruned once, after the last batch
+    assert fake_pipeline.chunks.calls.count("delete_many") == 1
+    assert len(fake_pipeline.chunks.rows) == 4
+    assert resumed.done
+    assert {d["ingest_version"] for d in fake_pipeline.chunks.rows} == {resumed.version}
@@ -0,0 +1,84 @@
+import pytest
+
+from rag_app.core.rag.chunk_cache import cache_chunk, hydrate_chunks
+from rag_app.core.utils.lru import LRUCache
+from rag_app.core.utils.metrics import get_counter, reset_metrics
+
+
+def _hit(doc):
+    # Phase-one row: key fields, _id and score only
+    return {k: doc[k] for k in ("_id", "tenant_id", "doc_id", "page_num", "chunk_index", "ingest_version")} | {"score": 0.9}
+
+
+@pytest.fixture
+def docs(chunks, chunk_row):
+    chunks.rows += [chunk_row(1, 0), chunk_row(1, 1), chunk_row(2, 0), chunk_row(1, 0, version="v2")]
+    reset_metrics()
+    return chunks.rows[:]
+
+
+def test_hydrate_dedupes_and_batches_misses(chunks, docs):
+    p1c0, p1c1, p2c0, _ = docs
+    cache_chunk(p1c1)
+
+    rows = hydrate_chunks([_hit(p1c0), _hit(p1c1), _hit(p1c0), _hit(p2c0)])
+
+    assert [r["text"] for r in rows] == ["v1 text 1.0", "v1 text 1.1", "v1 text 2.0"]
+    assert all("_id" not in r for r in rows)
+    # One $in query, for the two chunks that were not cached
+    assert chunks.filters == [{"_id": {"$in": [p1c0["_id"], p2c0["_id"]]}}]
+    assert get_counter("chunk_cache_hits") == 1
+
+    hydrate_chunks([_hit(p1c0), _hit(p2c0)])
+    assert len(chunks.filters) == 1
+
+
+def test_new_ingest_version_misses_the_cache(chunks, docs):
+    p1c0, _, _, p1c0_v2 = docs
+    hydrate_chunks([_hit(p1c0)])
+
+    # Same (tenant, doc, page, chunk_index) re-ingested elsewhere under a new version
+    rows = hydrate_chunks([_hit(p1c0_v2)])
+    assert rows[0]["text"] == "v2 text 1.0"
+    assert chunks.filters[-1] == {"_id": {"$in": [p1c0_v2["_id"]]}}
+
+
+def test_rows_deleted_before_the_fetch_are_dropped(chunks, docs):
+    p1c0, p1c1, p2c0, _ = docs
+    chunks.rows.remove(p2c0)   # pruned by a re-ingest between search and fetch
+
+    rows = hydrate_chunks([_hit(p1c0), _hit(p2c0), _hit(p1c1)])
+
+    assert [r["text"] for r in rows] == ["v1 text 1.0", "v1 text 1.1"]
+    assert get_counter("chunk_fetch_missing") == 1
+
+
+def test_rows_with_text_are_not_refetched(chunks, docs):
+    rows = hydrate_chunks([dict(docs[0])])
+    assert rows[0]["text"] == "v1 text 1.0"
+    assert chunks.filters == []
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache("test_lru", max_items=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_lru_evicts_by_size():
+    cache = LRUCache("test_lru_bytes", max_items=100, max_bytes=10, sizeof=len)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.put("c", b"123")
+    assert "a" not in cache and cache.total_bytes == 8
+
+    cache.put("huge", b"x" * 11)
+    assert "huge" not in cache and len(cache) == 2
+
+    cache.put("b", b"1")
+    assert cache.total_bytes == 4
@@ -0,0 +1,60 @@
+from rag_app.core.ingest.chunker import TextChunk
+from rag_app.core.ingest.dedupe import dedupe_chunks
+
+TOWER = (
+    "Tower A rises 39 floors with four apartments per floor, double height entrance lobby, "
+    "three high speed elevators and one service elevator, with a landscaped podium and clubhouse access."
+)
+DISCLAIMER = (
+    "Disclaimer: the plans, specifications, images and other details herein are only indicative "
+    "and are subject to change by the developer without any prior notice or obligation."
+)
+
+
+def _chunk(page, index, text):
+    return TextChunk(page_num=page, chunk_index=index, text=f"[Page {page}]\n{text}", image_path=f"p{page}.png")
+
+
+def test_near_duplicates_collapse_into_canonical():
+    chunks = [
+        _chunk(3, 0, TOWER),
+        _chunk(3, 1, DISCLAIMER),
+        _chunk(7, 0, TOWER.replace("39 floors", "39 floors,")),  # OCR-level noise
+        _chunk(7, 1, DISCLAIMER),
+        _chunk(9, 0, DISCLAIMER),
+    ]
+
+    kept, stats = dedupe_chunks(chunks)
+
+    assert [(c.page_num, c.chunk_index) for c in kept] == [(3, 0), (3, 1)]
+    assert kept[0].source_pages == [3, 7]
+    assert kept[1].source_pages == [3, 7, 9]
+    assert stats["dedupe_ratio"] == 0.6
+
+
+def test_distinct_and_short_chunks_are_kept():
+    chunks = [
+        _chunk(1, 0, TOWER),
+        _chunk(2, 0, DISCLAIMER),
+        _chunk(4, 0, "Page 4 content (Image only or layout page)"),
+        _chunk(5, 0, "Page 5 content (Image only or layout page)"),
+    ]
+
+    kept, stats = dedupe_chunks(chunks)
+
+    assert len(kept) == 4
+    assert stats["dedupe_ratio"] == 0.0
+
+
+def test_chunks_differing_only_in_numbers_are_kept():
+    unit = (
+        "Saleable area {} sq ft, three bedroom apartment with two balconies, utility, "
+        "modular kitchen provision and covered car parking in the basement levels."
+    )
+    chunks = [_chunk(p, 0, unit.format(area)) for p, area in ((10, 2150), (11, 2450), (12, 2850))]
+    chunks.append(_chunk(13, 0, unit.format(2450)))
+
+    kept, stats = dedupe_chunks(chunks)
+
+    assert [(c.page_num, c.source_pages) for c in kept] == [(10, [10]), (11, [11, 13]), (12, [12])]
+    assert stats["duplicates_removed"] == 1
@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+
+# Public entry points and the heavy dependencies they must not load at import time
+ENTRY_POINTS = [
+    "rag_app.core.rag.chain",
+    "rag_app.core.rag.retriever",
+    "rag_app.core.ingest.pipeline",
+    "rag_app.core.ingest.batch",
+    "rag_app.core.warmup",
+]
+HEAVY_MODULES = [
+    "groq",
+    "pymongo",
+    "certifi",
+    "numpy",
+    "fitz",
+    "pytesseract",
+    "PIL",
+    "langchain_huggingface",
+    "langchain_community",
+    "langchain_text_splitters",
+    "sentence_transformers",
+    "torch",
+]
+IMPORT_BUDGET_S = 0.5
+
+_PROBE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules and m not in before]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def _probe(module):
+    # Fresh interpreter per module so earlier imports do not hide the cost
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_entry_points_import_lazily():
+    for module in ENTRY_POINTS:
+        res = _probe(module)
+        print(f"{module}: {res['elapsed'] * 1000:.1f} ms")
+        assert res["loaded"] == [], f"{module} eagerly imports {res['loaded']}"
+        assert res["elapsed"] < IMPORT_BUDGET_S, f"{module} took {res['elapsed']:.3f}s to import"
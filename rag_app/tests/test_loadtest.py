@@ -0,0 +1,38 @@
+import pytest
+
+from rag_app.core.loadtest.runner import load_questions, percentile, run_load
+from rag_app.core.loadtest.stubs import stub_backends
+from rag_app.core.rag.chain import answer_question
+from rag_app.core.utils.metrics import span
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_span_tags_innermost_stage():
+    with pytest.raises(KeyError) as info:
+        with span("outer"):
+            with span("inner"):
+                raise KeyError("boom")
+    assert info.value.rag_stage == "inner"
+
+
+def test_run_load_against_stubbed_backends():
+    doc_id = "My-Home-Tridasa-E-Brochure"
+    with stub_backends(doc_id=doc_id, unthrottled=True):
+        report = run_load(
+            lambda q: answer_question(q, tenant_id="tenant_01", doc_id=doc_id, k=5, use_materialized=False),
+            load_questions(),
+            concurrency=4,
+            requests=20,
+            warmup_requests=2,
+        )
+
+    assert report["requests"] == 20
+    assert report["ok"] == 20
+    assert report["latency_ms"]["count"] == 20
+    assert "answer.retrieve" in report["stages_ms"]
@@ -0,0 +1,98 @@
+import pytest
+
+from rag_app.core.rag import chain, materialize
+from rag_app.core.rag.materialize import invalidate_answers, lookup_answer, materialize_answers, question_key
+from rag_app.core.storage import indexes
+from rag_app.core.storage.indexes import vector_index_caught_up
+from rag_app.core.utils.metrics import get_counter, reset_metrics
+
+
+@pytest.fixture
+def answers(monkeypatch, make_collection):
+    col = make_collection()
+    monkeypatch.setattr(materialize, "get_answers_collection", lambda: col)
+    reset_metrics()
+    return col
+
+
+def _stored(col):
+    return {(r["tenant_id"], r["doc_id"], r["question_key"]) for r in col.rows}
+
+
+def _answer(question, retrieved):
+    return {
+        "answer": f"answer to {question}",
+        "citations": [{"page_num": 4}] if retrieved else [],
+        "image_paths": [],
+        "primary_pdf_link": None,
+        "retrieved": retrieved,
+    }
+
+
+def test_question_key_ignores_phrasing():
+    assert question_key("Can you show me the site plan?") == question_key("site plan")
+    assert question_key("What's the POSSESSION date") == question_key("possession date?")
+    assert question_key("How many towers?") != question_key("How many floors?")
+    assert question_key("Can you show me?") == ""
+
+
+def test_lookup_hit_and_miss(answers):
+    answers.rows.append({"_id": 1, "tenant_id": "t1", "doc_id": "doc", "question_key": "plan site", "answer": "See page 4."})
+
+    hit = lookup_answer("Show me the site plan", tenant_id="t1", doc_id="doc")
+    assert hit == {"tenant_id": "t1", "doc_id": "doc", "question_key": "plan site", "answer": "See page 4."}
+    assert lookup_answer("Site plan?", tenant_id="t1", doc_id="other") is None
+    assert lookup_answer("Can you show me?", tenant_id="t1", doc_id="doc") is None
+    assert get_counter("materialized_hits") == 1
+    assert get_counter("materialized_misses") == 1
+
+
+def test_invalidate_only_touches_the_document(answers):
+    answers.rows += [
+        {"tenant_id": "t1", "doc_id": "doc", "question_key": "plan site"},
+        {"tenant_id": "t1", "doc_id": "doc", "question_key": "amenities"},
+        {"tenant_id": "t1", "doc_id": "other", "question_key": "amenities"},
+    ]
+
+    assert invalidate_answers("t1", "doc") == 2
+    assert _stored(answers) == {("t1", "other", "amenities")}
+
+
+def test_answers_without_context_are_not_stored(answers, monkeypatch):
+    def fake_answer(question, **kwargs):
+        assert kwargs["use_materialized"] is False
+        return _answer(question, retrieved=[] if "possession" in question.lower() else [{"page_num": 4}])
+
+    monkeypatch.setattr(chain, "answer_question", fake_answer)
+    res = materialize_answers("t1", "doc", ["What are the amenities?", "What is the possession date?"])
+
+    assert res["stored"] == 1
+    assert res["skipped_empty"] == ["What is the possession date?"]
+    assert _stored(answers) == {("t1", "doc", "amenities")}
+
+
+def test_rebuild_waits_for_the_vector_index(answers, monkeypatch):
+    calls = []
+    monkeypatch.setattr(chain, "answer_question", lambda q, **kw: calls.append(q) or _answer(q, [{"page_num": 1}]))
+
+    monkeypatch.setattr(indexes, "wait_for_vector_index", lambda *a, **kw: False)
+    res = materialize.rebuild_answers_in_background("t1", "doc", ["Amenities?"], ingest_version="v2").result(5)
+    assert res["index_ready"] is False and calls == []
+
+    monkeypatch.setattr(indexes, "wait_for_vector_index", lambda *a, **kw: True)
+    res = materialize.rebuild_answers_in_background("t1", "doc", ["Amenities?"], ingest_version="v2").result(5)
+    assert res["stored"] == 1 and calls == ["Amenities?"]
+
+
+def test_vector_index_caught_up(make_collection):
+    rows = [
+        {"_id": i, "tenant_id": "t1", "doc_id": "doc", "ingest_version": "v2", "embedding": [0.1, 0.2, 0.3]}
+        for i in range(3)
+    ]
+    col = make_collection(rows + [{"_id": 9, "tenant_id": "t1", "doc_id": "doc", "ingest_version": "v1"}])
+    assert vector_index_caught_up(col, "t1", "doc", "v2")
+    assert col.pipeline[0]["$vectorSearch"]["filter"]["ingest_version"] == "v2"
+
+    col.unindexed.add(2)
+    assert not vector_index_caught_up(col, "t1", "doc", "v2")
+    assert not vector_index_caught_up(make_collection(), "t1", "doc", "v2")
@@ -0,0 +1,60 @@
+import pytest
+
+from rag_app.core.rag.chain import answer_question
+from rag_app.core.utils import metrics
+from rag_app.core.utils.metrics import export_prometheus, get_stage_errors, observe, reset_metrics, span
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def test_histogram_buckets_are_cumulative():
+    observe("ocr", 0.003)   # first bucket
+    observe("ocr", 0.2)     # 0.25 bucket
+    observe("ocr", 60.0)    # +Inf only
+
+    lines = export_prometheus().splitlines()
+    assert 'rag_stage_seconds_bucket{stage="ocr",le="0.005"} 1' in lines
+    assert 'rag_stage_seconds_bucket{stage="ocr",le="0.1"} 1' in lines
+    assert 'rag_stage_seconds_bucket{stage="ocr",le="0.25"} 2' in lines
+    assert 'rag_stage_seconds_bucket{stage="ocr",le="30.0"} 2' in lines
+    assert 'rag_stage_seconds_bucket{stage="ocr",le="+Inf"} 3' in lines
+    assert 'rag_stage_seconds_count{stage="ocr"} 3' in lines
+
+    total = next(l for l in lines if l.startswith('rag_stage_seconds_sum{stage="ocr"}'))
+    assert float(total.split()[-1]) == pytest.approx(60.203)
+
+
+def test_counters_are_exported_with_total_suffix():
+    metrics.incr("chunk_cache.hits", 3)
+    assert "rag_chunk_cache_hits_total 3" in export_prometheus().splitlines()
+
+
+def test_stage_errors_use_a_stage_label():
+    with pytest.raises(RuntimeError):
+        with span("answer"):
+            with span("answer.llm"):
+                raise RuntimeError("boom")
+
+    assert get_stage_errors("answer.llm") == 1
+    assert get_stage_errors("answer") == 0
+
+    out = export_prometheus()
+    assert "# TYPE rag_stage_errors_total counter" in out
+    assert 'rag_stage_errors_total{stage="answer_llm"} 1' in out.splitlines()
+
+
+def test_answer_carries_stage_timings(chunks, chunk_row, fake_llm):
+    chunks.rows += [chunk_row(p, 0, f"Amenities on page {p}: clubhouse, pool, gym") for p in (1, 2, 3)]
+
+    res = answer_question("What are the amenities?", tenant_id="t1", doc_id="doc", k=5, rerank=False, use_materialized=False)
+
+    timings = res["timings"]
+    for stage in ("answer.retrieve", "retrieve.embed_query", "retrieve.vector_search", "answer.llm", "total"):
+        assert stage in timings
+    assert timings["total"] >= timings["answer.retrieve"]
+    assert len(fake_llm) == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from rag_app.core.rag import chain
+from rag_app.core.rag.retriever import _rank_by_terms, retrieve_page_chunks
+
+
+@pytest.fixture
+def fake(chunks, chunk_row):
+    chunks.rows += [
+        chunk_row(3, 0, "Clubhouse with swimming pool and gym", source_pages=[3, 7]),
+        chunk_row(7, 0, "Site plan legend"),
+        chunk_row(7, 1, "Swimming pool deck and kids play area"),
+        chunk_row(9, 0, "Kitchen 10' x 8'"),
+    ] + [chunk_row(12, i, f"Specification {i}") for i in range(6)]
+    return chunks
+
+
+def test_rank_by_terms_orders_by_overlap_and_keeps_chunk_order_on_ties():
+    rows = [{"text": "Kitchen size"}, {"text": "swimming pool"}, {"text": "Pool, gym and swimming"}]
+    ranked = _rank_by_terms("Is there a swimming pool?", rows)
+    assert [r["text"] for r in ranked] == ["swimming pool", "Pool, gym and swimming", "Kitchen size"]
+    assert ranked[0]["score"] == pytest.approx(2 / 5)
+
+    assert [r["score"] for r in _rank_by_terms("?!", [{"text": "a"}])] == [0.0]
+
+
+def test_small_page_is_read_directly(fake):
+    rows = retrieve_page_chunks("swimming pool", tenant_id="t1", doc_id="doc", page_num=7, k=2, direct_max_chunks=4)
+
+    assert fake.calls == ["count", "find"]
+    assert fake.embeds == []
+    # Includes the de-duplicated chunk stored under page 3
+    assert {r["chunk_index"] for r in rows} == {0, 1}
+    assert all("swimming pool" in r["text"].lower() for r in rows)
+    # ... which is cited as the requested page but keeps its stored identity
+    assert {(r["page_num"], r["cited_page"]) for r in rows} == {(3, 7), (7, 7)}
+
+
+def test_large_page_falls_back_without_reading_bodies(fake):
+    rows = retrieve_page_chunks("specs", tenant_id="t1", doc_id="doc", page_num=12, k=3, direct_max_chunks=4)
+
+    assert fake.calls == ["count", "aggregate"]
+    assert fake.embeds == ["specs"]
+    assert len(rows) == 3
+    assert fake.pipeline[0]["$vectorSearch"]["filter"]["doc_id"] == "doc"
+
+
+def test_fallback_cites_deduplicated_chunks_as_the_requested_page(fake, chunk_row):
+    fake.rows += [chunk_row(12, i, f"Flooring {i}", source_pages=[12, 14]) for i in range(6, 12)]
+    rows = retrieve_page_chunks("flooring", tenant_id="t1", doc_id="doc", page_num=14, k=3, direct_max_chunks=4, fetch_text=False)
+
+    # Ids and scores only; bodies are hydrated later under the stored key
+    assert fake.calls == ["count", "aggregate"]
+    assert len(rows) == 3
+    assert {(r["page_num"], r["cited_page"]) for r in rows} == {(12, 14)}
+    assert all("text" not in r for r in rows)
+
+
+def test_page_question_keeps_both_chunks_that_share_an_index(fake, fake_llm, monkeypatch):
+    # Page 7's own chunk 0 and the canonical chunk 0 stored under page 3 (source_pages [3, 7])
+    monkeypatch.setattr(chain, "RETRIEVAL_TWO_PHASE", True)
+
+    res = chain.answer_question("swimming pool", tenant_id="t1", doc_id="doc", page_num=7, k=5, rerank=False)
+
+    cited = {(c["chunk_page"], c["chunk_index"]): c for c in res["citations"]}
+    assert set(cited) == {(3, 0), (7, 0), (7, 1)}
+    assert {c["page_num"] for c in cited.values()} == {7}
+    assert {c["image_path"] for c in cited.values()} == {"storage/images/doc/page_7.png"}
+    assert res["image_paths"] == ["storage/images/doc/page_7.png"]
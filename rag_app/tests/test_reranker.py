@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from rag_app.core.rag import reranker
+from rag_app.core.rag.reranker import rerank
+from rag_app.core.utils.metrics import get_counter, reset_metrics
+
+
+class StubCrossEncoder:
+    """
+    Scores a pair by the number of times "pool" appears in the chunk; optionally blocks until released.
+    """
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.started = threading.Event()
+        self.calls = []
+
+    def predict(self, pairs, batch_size, show_progress_bar):
+        self.calls.append(list(pairs))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return [text.count("pool") for _, text in pairs]
+
+
+def _rows(*texts):
+    return [
+        {"tenant_id": "t1", "doc_id": "doc", "page_num": i + 1, "chunk_index": 0, "ingest_version": "v1", "text": t, "score": 0.9 - i * 0.1}
+        for i, t in enumerate(texts)
+    ]
+
+
+def _drain():
+    # The scoring pool has one thread: once this no-op runs, everything queued before it is done
+    reranker._pool.submit(lambda: None).result(5)
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    reranker._score_cache.clear()
+    reset_metrics()
+    yield
+    _drain()
+    reranker._score_cache.clear()
+
+
+def test_reorders_and_caches(monkeypatch):
+    model = StubCrossEncoder()
+    monkeypatch.setattr(reranker, "get_reranker", lambda: model)
+
+    out = rerank("amenities", _rows("gym", "pool pool", "pool"), top_n=2, budget_ms=5000)
+    assert [r["text"] for r in out] == ["pool pool", "pool"]
+    assert out[0]["rerank_score"] == 2
+
+    # Cached pairs are not scored again; only the new chunk is
+    rerank("amenities", _rows("gym", "pool pool", "pool", "clubhouse pool"), top_n=2, budget_ms=5000)
+    assert [len(c) for c in model.calls] == [3, 1]
+
+
+def test_budget_exceeded_keeps_vector_order_and_cancels_queued_work(monkeypatch):
+    gate = threading.Event()
+    model = StubCrossEncoder(gate)
+    monkeypatch.setattr(reranker, "get_reranker", lambda: model)
+
+    rows = _rows("gym", "pool pool")
+    out = rerank("slow", rows, top_n=2, budget_ms=200)
+    assert [r["text"] for r in out] == ["gym", "pool pool"]
+    assert model.started.is_set()   # running (blocked on the gate), so not cancellable
+
+    # The scoring thread is busy, so this job is still queued when its budget runs out
+    rerank("queued", _rows("pool"), top_n=1, budget_ms=20)
+    assert get_counter("rerank_budget_exceeded") == 2
+    assert get_counter("rerank_cancelled") == 1
+
+    gate.set()
+    _drain()
+    assert [pairs[0][0] for pairs in model.calls] == ["slow"]
+
+    # The job that had already started finished in the background and filled the cache
+    out = rerank("slow", rows, top_n=2, budget_ms=20)
+    assert [r["text"] for r in out] == ["pool pool", "gym"]
+    assert len(model.calls) == 1
+
+
+def test_expired_job_is_dropped(monkeypatch):
+    model = StubCrossEncoder()
+    monkeypatch.setattr(reranker, "get_reranker", lambda: model)
+
+    assert reranker._score_pairs([("q", "pool")], deadline=0.0) is None
+    assert model.calls == []
+    assert get_counter("rerank_expired") == 1
+
+
+def test_model_error_falls_back(monkeypatch):
+    def broken():
+        raise RuntimeError("no model")
+
+    monkeypatch.setattr(reranker, "get_reranker", broken)
+    out = rerank("q", _rows("a", "b", "c"), top_n=2, budget_ms=5000)
+    assert [r["text"] for r in out] == ["a", "b"]
+    assert get_counter("rerank_errors") == 1
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from rag_app.core.utils.scheduler import BACKGROUND, INTERACTIVE, PriorityLimiter, Provider, TokenBucket
+
+
+def _provider(**kwargs):
+    settings = {"rate_per_sec": 1000.0, "burst": 1000.0, "max_concurrency": 4, "base_delay": 0.0}
+    settings.update(kwargs)
+    return Provider("test", **settings)
+
+
+def test_single_flight_coalesces_identical_calls():
+    provider = _provider()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "answer"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(provider.call(slow, key="same")))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["answer"] * 5
+
+
+def test_retries_then_raises(caplog):
+    provider = _provider()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise IOError("boom")
+
+    try:
+        provider.call(failing, retries=3)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+    assert len(attempts) == 3
+    assert [r.getMessage() for r in caplog.records if r.name == "rag_app.core.utils.scheduler"] == [
+        f"test call failed (attempt {i}/3): boom" for i in (1, 2, 3)
+    ]
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+
+def test_background_waits_for_interactive():
+    limiter = PriorityLimiter(max_concurrency=1, background_share=1.0)
+    limiter.acquire(INTERACTIVE)
+    order = []
+
+    def run(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+        limiter.release(priority)
+
+    bg = threading.Thread(target=run, args=(BACKGROUND,))
+    bg.start()
+    _wait_until(lambda: limiter._waiting[BACKGROUND] == 1)
+    fg = threading.Thread(target=run, args=(INTERACTIVE,))
+    fg.start()
+    _wait_until(lambda: limiter._waiting[INTERACTIVE] == 1)
+
+    limiter.release(INTERACTIVE)
+    bg.join()
+    fg.join()
+    assert order == [INTERACTIVE, BACKGROUND]
+
+
+def test_bucket_reserves_tokens_for_interactive():
+    bucket = TokenBucket(rate=0.001, burst=4, reserve=2)
+
+    assert bucket.try_acquire(BACKGROUND) == 0
+    assert bucket.try_acquire(BACKGROUND) == 0
+    # Only the reserve is left: background must wait, interactive gets it at once
+    assert bucket.try_acquire(BACKGROUND) > 0
+    assert bucket.try_acquire(INTERACTIVE) == 0
+    assert bucket.try_acquire(INTERACTIVE) == 0
+    assert bucket.try_acquire(INTERACTIVE) > 0
+
+
+def test_background_yields_to_waiting_interactive():
+    bucket = TokenBucket(rate=0.001, burst=2, reserve=0)
+    bucket.try_acquire(INTERACTIVE)
+    bucket.try_acquire(INTERACTIVE)
+
+    # Daemon: at this rate the waiter would sleep for minutes; the test never joins it
+    fg = threading.Thread(target=bucket.acquire, args=(INTERACTIVE,), daemon=True)
+    fg.start()
+    _wait_until(lambda: bucket._interactive_waiting == 1)
+
+    # A token becomes available while the interactive caller sleeps: background may not take it
+    with bucket._lock:
+        bucket._tokens = 1.0
+    assert bucket.try_acquire(BACKGROUND) > 0
+    assert bucket.try_acquire(INTERACTIVE) == 0
+
+
+def test_provider_reserve_is_capped_by_burst():
+    assert _provider(burst=1.0).bucket.reserve == 0.0
+    assert _provider(burst=10.0, background_share=0.3).bucket.reserve == pytest.approx(7.0)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from rag_app.core.storage.vectors import cosine_scores, decode_vector, encode_vector
+
+VEC = [0.12, -0.5, 0.33, 0.0, 0.9, -0.07]
+
+
+def test_roundtrip_formats():
+    for fmt, tol in [("list", 1e-6), ("float32", 1e-6), ("float16", 1e-3), ("int8", 1e-2)]:
+        doc = encode_vector(VEC, fmt)
+        out = decode_vector(doc)
+        assert out.shape == (len(VEC),)
+        assert np.allclose(out, VEC, atol=tol), fmt
+
+
+def test_packed_is_smaller():
+    doc = encode_vector(VEC * 64, "int8")
+    assert len(doc["embedding"]) == len(VEC) * 64 + 2
+
+
+def test_cosine_scores_order():
+    a = decode_vector(encode_vector(VEC, "int8"))
+    b = decode_vector(encode_vector([-x for x in VEC], "float16"))
+    scores = cosine_scores(VEC, [a, b])
+    assert scores[0] > 0.99
+    assert scores[1] < -0.99
+
+
+def test_float16_keeps_an_indexable_vector():
+    doc = encode_vector(VEC, "float16")
+    # "embedding" is what $vectorSearch indexes: it must be a BSON binary vector (subtype 9)
+    assert doc["embedding"].subtype == 9
+    assert doc["embedding"][0] == 0x03
+    assert "embedding_f16" in doc and doc["embedding_f16"].subtype != 9
+
+    # Rescoring prefers the float16 copy over the int8 index vector
+    assert np.allclose(decode_vector(doc), VEC, atol=1e-3)
+    assert np.allclose(decode_vector({k: v for k, v in doc.items() if k != "embedding_f16"}), VEC, atol=1e-2)
@@ -1,10 +1,43 @@
-from rag_app.core.ingest.pipeline import ingest_pdf
+import argparse
+import json
 
-result = ingest_pdf(
-    pdf_path="rag_app/data/raw/My-Home-Tridasa-E-Brochure.pdf",
-    tenant_id="tenant_01",
-    doc_id="My-Home-Tridasa-E-Brochure",
-    ocr_lang="eng",
+from rag_app.core.config import CHECKPOINT_DIR, INGEST_PER_TENANT, INGEST_WORKERS
+from rag_app.core.ingest.batch import IngestJob, load_jobs, run_batch
+from rag_app.core.storage.indexes import bootstrap_storage
+
+parser = argparse.ArgumentParser(description="Ingest brochure PDFs into MongoDB.")
+parser.add_argument("source", nargs="?", help="Directory of PDFs or a JSON/JSONL manifest")
+parser.add_argument("--tenant", default="tenant_01", help="Tenant for directory sources / manifest entries without one")
+parser.add_argument("--ocr-lang", default="eng")
+parser.add_argument("--workers", type=int, default=INGEST_WORKERS)
+parser.add_argument("--per-tenant", type=int, default=INGEST_PER_TENANT)
+parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+parser.add_argument("--force", action="store_true", help="Ignore checkpoints and re-ingest from scratch")
+parser.add_argument("--skip-index-check", action="store_true", help="Do not create/verify MongoDB indexes")
+args = parser.parse_args()
+
+if not args.skip_index_check:
+    print("Index check:", bootstrap_storage())
+
+if args.source:
+    jobs = load_jobs(args.source, tenant_id=args.tenant, ocr_lang=args.ocr_lang)
+else:
+    jobs = [
+        IngestJob(
+            pdf_path="rag_app/data/raw/My-Home-Tridasa-E-Brochure.pdf",
+            tenant_id=args.tenant,
+            doc_id="My-Home-Tridasa-E-Brochure",
+            ocr_lang=args.ocr_lang,
+        )
+    ]
+
+result = run_batch(
+    jobs,
+    workers=args.workers,
+    per_tenant=args.per_tenant,
+    checkpoint_dir=args.checkpoint_dir,
+    force=args.force,
 )
 
-print(result)
+summary = {k: v for k, v in result.items() if k not in ("results",)}
+print(json.dumps(summary, indent=2))
@@ -0,0 +1,66 @@
+import argparse
+import json
+
+from rag_app.core.loadtest.runner import format_report, load_questions, run_load
+from rag_app.core.loadtest.stubs import LatencyDist, StubBackend, stub_backends
+from rag_app.core.rag.chain import answer_question
+
+parser = argparse.ArgumentParser(description="Closed-loop load test of answer_question.")
+parser.add_argument("--questions", help="Recorded questions (JSONL with question/weight, or one per line); default synthetic mix")
+parser.add_argument("--tenant", default="tenant_01")
+parser.add_argument("--doc-id", default="My-Home-Tridasa-E-Brochure")
+parser.add_argument("--k", type=int, default=15)
+parser.add_argument("--concurrency", type=int, default=8)
+parser.add_argument("--requests", type=int, default=200)
+parser.add_argument("--duration", type=float, help="Stop after this many seconds instead of a request count")
+parser.add_argument("--rate", type=float, help="Cap arrival rate (req/s) across all virtual users")
+parser.add_argument("--think-ms", type=float, default=0.0)
+parser.add_argument("--warmup", type=int, default=0, help="Unmeasured requests sent first")
+parser.add_argument("--live", action="store_true", help="Hit the real HF/MongoDB/Groq backends instead of stubs")
+# Stub behaviour (latency specs in ms: fixed:50, uniform:20,80, normal:100,20, lognormal:120,0.5)
+parser.add_argument("--embed-latency", default="lognormal:80,0.4")
+parser.add_argument("--search-latency", default="lognormal:40,0.3")
+parser.add_argument("--fetch-latency", default="lognormal:5,0.3")
+parser.add_argument("--llm-latency", default="lognormal:700,0.5")
+parser.add_argument("--embed-errors", type=float, default=0.0)
+parser.add_argument("--search-errors", type=float, default=0.0)
+parser.add_argument("--llm-errors", type=float, default=0.0)
+parser.add_argument("--materialized-hit-rate", type=float, default=0.0)
+parser.add_argument("--unthrottled", action="store_true", help="Lift provider rate/concurrency limits")
+parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+args = parser.parse_args()
+
+
+def target(question):
+    return answer_question(question, tenant_id=args.tenant, doc_id=args.doc_id, k=args.k)
+
+
+def run():
+    return run_load(
+        target,
+        load_questions(args.questions),
+        concurrency=args.concurrency,
+        requests=None if args.duration else args.requests,
+        duration_s=args.duration,
+        arrival_rate=args.rate,
+        think_time_ms=args.think_ms,
+        warmup_requests=args.warmup,
+    )
+
+
+if args.live:
+    report = run()
+else:
+    with stub_backends(
+        tenant_id=args.tenant,
+        doc_id=args.doc_id,
+        embed=StubBackend("embed", LatencyDist(args.embed_latency), args.embed_errors),
+        search=StubBackend("search", LatencyDist(args.search_latency), args.search_errors),
+        fetch=StubBackend("fetch", LatencyDist(args.fetch_latency)),
+        llm=StubBackend("llm", LatencyDist(args.llm_latency), args.llm_errors),
+        materialized_hit_rate=args.materialized_hit_rate,
+        unthrottled=args.unthrottled,
+    ):
+        report = run()
+
+print(json.dumps(report, indent=2) if args.json else format_report(report))